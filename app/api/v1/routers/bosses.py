@@ -1,6 +1,7 @@
 """Rotas relacionadas a Bosses."""
 
 import re
+from typing import Optional
 
 from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from motor.motor_asyncio import AsyncIOMotorDatabase
@@ -24,7 +25,10 @@ router = APIRouter(
     "",
     response_model=PaginatedResponse[BossShortSchema],
     summary="Listar bosses com paginação",
-    description="Retorna uma lista paginada de bosses. Use os parâmetros `page` e `limit` para controlar a paginação.",
+    description=(
+        "Retorna uma lista paginada de bosses. Use os parâmetros `page` e `limit` para controlar a paginação, "
+        "ou `after` (slug do último item recebido) para paginação por cursor, recomendada para percorrer toda a lista."
+    ),
     responses={
         200: {"description": "Lista de bosses retornada com sucesso"},
         422: {"description": "Parâmetros de validação inválidos"},
@@ -37,6 +41,15 @@ async def list_bosses(
     limit: int = Query(
         default=20, ge=1, le=100, description="Número de itens por página (máximo 100)"
     ),
+    after: Optional[str] = Query(
+        default=None,
+        min_length=1,
+        description="Slug do último item recebido; retorna os bosses seguintes (ignora `page`)",
+    ),
+    estimate: bool = Query(
+        default=False,
+        description="Usa uma contagem estimada (metadados da coleção) para `total`, mais barata que a exata",
+    ),
     db: AsyncIOMotorDatabase = Depends(get_database),
 ):
     """
@@ -45,27 +58,33 @@ async def list_bosses(
     Args:
         page: Número da página (padrão: 1)
         limit: Número de itens por página (padrão: 20, máximo: 100)
+        after: Slug do último item recebido (paginação por cursor, sem skip)
+        estimate: Se True, `total` vem de estimated_document_count
         db: Instância do banco de dados (injetada via Dependency Injection)
 
     Returns:
-        Resposta paginada com lista de bosses e metadados
+        Resposta paginada com lista de bosses e metadados (com `after`, `page` e `pages`
+        são null e a próxima página é pedida com `next_after`)
     """
     repository = BossRepository(db)
 
-    # Calcula skip baseado na página
-    skip = (page - 1) * limit
+    # Calcula skip baseado na página (com cursor, a posição vem do próprio slug)
+    skip = 0 if after else (page - 1) * limit
 
     # Busca bosses e total
-    bosses = await repository.list_bosses(skip=skip, limit=limit)
-    total = await repository.count()
+    bosses = await repository.list_bosses(skip=skip, limit=limit, after=after)
+    total = await repository.count(estimate=estimate)
 
     # Busca última atualização
     jobs_repo = SystemJobsRepository(db)
     status = await jobs_repo.get_scraper_status()
     latest_update = status.last_run.isoformat() if status and status.last_run else None
 
-    # Calcula número de páginas
-    pages = (total + limit - 1) // limit if total > 0 else 0
+    # Calcula número de páginas (sem significado na paginação por cursor)
+    if after:
+        page_number, pages = None, None
+    else:
+        page_number, pages = page, (total + limit - 1) // limit if total > 0 else 0
 
     # Converte BossModel para BossShortSchema
     items = [
@@ -81,12 +100,17 @@ async def list_bosses(
         for boss in bosses
     ]
 
+    # Página cheia: pode haver mais itens depois do último slug
+    next_after = items[-1].slug if len(items) == limit else None
+
     return PaginatedResponse(
         items=items,
         total=total,
-        page=page,
+        page=page_number,
         size=len(items),
         pages=pages,
+        total_estimated=estimate,
+        next_after=next_after,
         latest_update=latest_update,
     )
 
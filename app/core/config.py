@@ -18,6 +18,9 @@ class Settings(BaseSettings):
     # Admin
     admin_secret: str = "changeme"
 
+    # Scraper: processos do pool de parse (limitado às CPUs disponíveis ao processo)
+    parse_workers: int = 2
+
     # Segurança / Hosts confiáveis
     allowed_hosts: List[str] = ["localhost", "127.0.0.1", ".onrender.com"]
 
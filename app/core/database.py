@@ -2,7 +2,7 @@
 
 import logging
 import os
-from typing import Optional
+from typing import Optional, Set
 
 import certifi
 from fastapi import HTTPException, status
@@ -14,6 +14,9 @@ logger = logging.getLogger(__name__)
 _database: Optional[AsyncIOMotorDatabase] = None
 _client: Optional[AsyncIOMotorClient] = None
 
+# Bancos cujos índices já foram garantidos neste processo
+_INDEXES_ENSURED: Set[str] = set()
+
 
 def get_database() -> AsyncIOMotorDatabase:
     """
@@ -82,8 +85,8 @@ async def init_database(
         await _client.admin.command("ping")
         logger.info(f"✅ Conectado ao MongoDB: {database_name} com sucesso!")
 
-        # Cria os índices
-        await _create_indexes(_database)
+        # Cria os índices (uma única vez por banco)
+        await ensure_indexes(_database)
 
         return _database
 
@@ -96,6 +99,22 @@ async def init_database(
         raise
 
 
+async def ensure_indexes(db: AsyncIOMotorDatabase):
+    """
+    Garante os índices do banco uma única vez por processo.
+
+    Chamadas seguintes para o mesmo banco retornam sem ir ao servidor.
+
+    Args:
+        db: Instância do banco de dados
+    """
+    if db.name in _INDEXES_ENSURED:
+        return
+
+    await _create_indexes(db)
+    _INDEXES_ENSURED.add(db.name)
+
+
 async def _create_indexes(db: AsyncIOMotorDatabase):
     """Cria os índices necessários no banco de dados."""
     try:
@@ -114,4 +133,5 @@ async def close_database():
         _client.close()
         _client = None
         _database = None
+        _INDEXES_ENSURED.clear()
         logger.info("Conexão com MongoDB fechada")
@@ -1,9 +1,11 @@
 """Repositório MongoDB para operações de persistência de Bosses."""
 
 import logging
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
 
 from app.models.boss import BossModel
 
@@ -13,6 +15,22 @@ logger = logging.getLogger(__name__)
 class BossRepository:
     """Repositório para operações de persistência de Bosses no MongoDB."""
 
+    # Projection das listagens: apenas os campos de BossShortSchema, aplicada no servidor
+    # (não trafega listas de loot/habilidades nem outros campos pesados)
+    _LIST_PROJECTION = {
+        "name": 1,
+        "slug": 1,
+        "visuals": 1,
+        "hp": 1,
+        "speed": 1,
+        "location": 1,
+        "bosstiary": 1,
+        "_id": 0,  # Exclui _id do MongoDB
+    }
+
+    # Ordem estável para paginação com skip/limit, servida pelo índice único de slug
+    _LIST_SORT = [("slug", 1)]
+
     def __init__(self, database: AsyncIOMotorDatabase):
         """
         Inicializa o repositório.
@@ -23,6 +41,46 @@ class BossRepository:
         self.db = database
         self.collection = database.bosses
 
+    @staticmethod
+    def _to_document(boss: BossModel) -> dict:
+        """
+        Converte um boss no documento persistido, garantindo o slug.
+
+        Campos None não são gravados (documentos menores no MongoDB).
+
+        Args:
+            boss: Instância de BossModel
+
+        Returns:
+            Dicionário pronto para o $set do MongoDB
+        """
+        boss_dict = boss.model_dump(exclude={"slug"}, exclude_none=True)
+        boss_dict["slug"] = boss.slug or boss.get_slug()
+        return boss_dict
+
+    @classmethod
+    def _to_update(cls, boss: BossModel) -> dict:
+        """
+        Monta o update do upsert de um boss.
+
+        Campos que ficaram None são removidos do documento com $unset, para que
+        um valor antigo não permaneça no banco.
+
+        Args:
+            boss: Instância de BossModel
+
+        Returns:
+            Documento de update com $set (e $unset, se houver campos vazios)
+        """
+        boss_dict = cls._to_document(boss)
+        update = {"$set": boss_dict}
+
+        missing_fields = BossModel.model_fields.keys() - boss_dict.keys()
+        if missing_fields:
+            update["$unset"] = dict.fromkeys(sorted(missing_fields), "")
+
+        return update
+
     async def upsert(self, boss: BossModel) -> bool:
         """
         Insere ou atualiza um boss no banco de dados usando slug como chave.
@@ -34,17 +92,14 @@ class BossRepository:
             True se sucesso, False caso contrário
         """
         try:
-            # Gera o slug se não fornecido
-            slug = boss.slug or boss.get_slug()
-
-            # Converte o modelo para dict
-            boss_dict = boss.model_dump(exclude={"slug"})
-            boss_dict["slug"] = slug
+            # Converte o modelo para update (gerando o slug se não fornecido)
+            update = self._to_update(boss)
+            slug = update["$set"]["slug"]
 
             # Usa find_one_and_update com upsert=True
             result = await self.collection.find_one_and_update(
                 {"slug": slug},
-                {"$set": boss_dict},
+                update,
                 upsert=True,
                 return_document=True,
             )
@@ -59,12 +114,16 @@ class BossRepository:
             logger.error(f"Erro ao fazer upsert do boss {boss.name}: {e}")
             return False
 
-    async def upsert_batch(self, bosses: List[BossModel]) -> int:
+    async def upsert_batch(self, bosses: List[BossModel], bulk_size: int = 1000) -> int:
         """
-        Insere ou atualiza múltiplos bosses em lote.
+        Insere ou atualiza múltiplos bosses em lote usando bulk_write.
+
+        As operações são enviadas em blocos de até bulk_size com ordered=False,
+        de modo que uma falha isolada não interrompe o restante do bloco.
 
         Args:
             bosses: Lista de instâncias de BossModel
+            bulk_size: Número máximo de operações por chamada ao bulk_write
 
         Returns:
             Número de bosses processados com sucesso
@@ -74,26 +133,43 @@ class BossRepository:
 
         success_count = 0
 
-        # Processa cada boss individualmente (pode ser otimizado com bulk_write no futuro)
-        for boss in bosses:
-            if await self.upsert(boss):
-                success_count += 1
+        for i in range(0, len(bosses), bulk_size):
+            operations = []
+            for boss in bosses[i : i + bulk_size]:
+                update = self._to_update(boss)
+                operations.append(UpdateOne({"slug": update["$set"]["slug"]}, update, upsert=True))
+
+            try:
+                result = await self.collection.bulk_write(operations, ordered=False)
+                success_count += result.upserted_count + result.matched_count
+            except BulkWriteError as e:
+                details = e.details or {}
+                success_count += details.get("nUpserted", 0) + details.get("nMatched", 0)
+                logger.error(
+                    f"Erro em bulk upsert: {len(details.get('writeErrors', []))} operações falharam"
+                )
+            except Exception as e:
+                logger.error(f"Erro ao fazer bulk upsert de {len(operations)} bosses: {e}")
 
         logger.info(f"Batch upsert: {success_count}/{len(bosses)} bosses processados")
         return success_count
 
-    async def find_by_slug(self, slug: str) -> Optional[BossModel]:
+    async def find_by_slug(
+        self, slug: str, projection: Optional[Dict[str, int]] = None
+    ) -> Optional[BossModel]:
         """
         Busca um boss pelo slug.
 
         Args:
             slug: Slug do boss
+            projection: Campos a retornar (ex: {"name": 1, "hp": 1}). Se None,
+                retorna o documento completo. Deve incluir "name" (obrigatório no modelo).
 
         Returns:
             Instância de BossModel ou None se não encontrado
         """
         try:
-            document = await self.collection.find_one({"slug": slug})
+            document = await self.collection.find_one({"slug": slug}, projection)
 
             if document:
                 # Remove o _id do MongoDB antes de criar o modelo
@@ -129,19 +205,41 @@ class BossRepository:
             logger.error(f"Erro ao buscar boss por nome {name}: {e}")
             return None
 
-    async def count(self) -> int:
+    async def count(self, estimate: bool = False) -> int:
         """
         Retorna o número total de bosses no banco.
 
+        Args:
+            estimate: Se True, usa estimated_document_count (lê os metadados da coleção,
+                sem percorrer índice/documentos). Pode divergir após shutdowns não limpos.
+
         Returns:
             Número total de documentos
         """
         try:
+            if estimate:
+                return await self.collection.estimated_document_count()
             return await self.collection.count_documents({})
         except Exception as e:
             logger.error(f"Erro ao contar bosses: {e}")
             return 0
 
+    @staticmethod
+    def _name_search_filter(query: str) -> Dict:
+        """
+        Monta o filtro da busca por nome (regex case insensitive, sem âncora).
+
+        A regex não tem prefixo fixo, então o índice de name não limita a busca: o MongoDB
+        avalia a regex em todas as chaves (varredura completa do índice ou da coleção).
+
+        Args:
+            query: String de busca
+
+        Returns:
+            Filtro MongoDB compartilhado pela busca e pela contagem
+        """
+        return {"name": {"$regex": query, "$options": "i"}}
+
     async def search_by_name(self, query: str, skip: int = 0, limit: int = 20) -> List[BossModel]:
         """
         Busca bosses por nome usando regex (case insensitive).
@@ -155,19 +253,12 @@ class BossRepository:
             Lista de instâncias de BossModel que correspondem à busca
         """
         try:
-            # Projection: retorna apenas os campos necessários para listagem
-            projection = {
-                "name": 1,
-                "slug": 1,
-                "visuals": 1,
-                "hp": 1,
-                "_id": 0,
-            }
-
-            # Cria filtro regex case insensitive
-            filter_query = {"name": {"$regex": query, "$options": "i"}}
-
-            cursor = self.collection.find(filter_query, projection).skip(skip).limit(limit)
+            cursor = (
+                self.collection.find(self._name_search_filter(query), self._LIST_PROJECTION)
+                .sort(self._LIST_SORT)
+                .skip(skip)
+                .limit(limit)
+            )
             documents = await cursor.to_list(length=limit)
 
             # Converte documentos para BossModel
@@ -197,35 +288,35 @@ class BossRepository:
             Número total de documentos que correspondem à busca
         """
         try:
-            filter_query = {"name": {"$regex": query, "$options": "i"}}
-            return await self.collection.count_documents(filter_query)
+            return await self.collection.count_documents(self._name_search_filter(query))
         except Exception as e:
             logger.error(f"Erro ao contar bosses por busca: {e}")
             return 0
 
-    async def list_bosses(self, skip: int = 0, limit: int = 20) -> List[BossModel]:
+    async def list_bosses(
+        self, skip: int = 0, limit: int = 20, after: Optional[str] = None
+    ) -> List[BossModel]:
         """
         Lista bosses com paginação usando projection para otimizar.
 
         Args:
             skip: Número de documentos a pular
             limit: Número máximo de documentos a retornar
+            after: Slug do último item da página anterior. Quando informado, a página
+                começa no slug seguinte via range no índice de slug, sem percorrer os
+                documentos anteriores como o skip faz
 
         Returns:
             Lista de instâncias de BossModel (apenas campos essenciais)
         """
         try:
-            # Projection: retorna apenas os campos necessários para listagem
-            # Não retorna raw_wikitext ou outros campos pesados
-            projection = {
-                "name": 1,
-                "slug": 1,
-                "visuals": 1,
-                "hp": 1,
-                "_id": 0,  # Exclui _id do MongoDB
-            }
-
-            cursor = self.collection.find({}, projection).skip(skip).limit(limit)
+            filter_query = {"slug": {"$gt": after}} if after else {}
+            cursor = (
+                self.collection.find(filter_query, self._LIST_PROJECTION)
+                .sort(self._LIST_SORT)
+                .skip(skip)
+                .limit(limit)
+            )
             documents = await cursor.to_list(length=limit)
 
             # Converte documentos para BossModel
@@ -18,6 +18,7 @@ from app.core.rate_limit import (
     _rate_limit_exceeded_handler,
     limiter,
 )
+from app.main_scraper import shutdown_parse_pool
 from app.services.scraper_job import run_scraper_job
 
 # Scheduler global para o processo FastAPI
@@ -33,7 +34,7 @@ async def lifespan(app: FastAPI):
 
     - Inicializa conexão MongoDB e cria índices
     - Configura o APScheduler com job semanal
-    - Fecha conexão e desliga o scheduler ao encerrar
+    - Fecha conexão, desliga o scheduler e o pool de parse (se um job estiver rodando)
     """
     # Startup: Inicializa MongoDB e cria índices
     print("🔌 Conectando ao MongoDB...")
@@ -82,9 +83,10 @@ async def lifespan(app: FastAPI):
 
     yield
 
-    # Shutdown: encerra scheduler e fecha conexão MongoDB
+    # Shutdown: encerra scheduler, processos de parse e fecha conexão MongoDB
     if scheduler.running:
         scheduler.shutdown(wait=False)
+    await shutdown_parse_pool()
     await close_database()
 
 
@@ -9,7 +9,10 @@ Este script integra:
 
 import asyncio
 import logging
-from typing import Dict, List, Optional
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Union
 
 from app.core.config import settings
 from app.db.connection import close_database, init_database
@@ -18,6 +21,7 @@ from app.models.boss import BossModel, BossVisuals
 from app.services.image_resolver import ImageResolverService
 from app.services.tibiawiki_client import TibiaWikiClient
 from app.services.wikitext_parser import ParserError, WikitextParser
+from app.utils.adaptive_limiter import AdaptiveLimiter
 from app.utils.dead_letter_logger import dead_letter_logger
 
 # Configuração de logging
@@ -31,13 +35,77 @@ logger = logging.getLogger(__name__)
 
 # Configurações
 MAX_CONCURRENT_REQUESTS = 10
-BATCH_SIZE = 50  # Tamanho do lote para processamento de imagens e salvamento
+BULK_WRITE_SIZE = 1000  # Operações por chamada ao bulk_write do MongoDB
+
+# Pool de processos para o parse (CPU-bound), criado sob demanda e encerrado ao fim do job
+_parse_pool: Optional[ProcessPoolExecutor] = None
+
+
+def parse_worker_count() -> int:
+    """
+    Número de processos do pool de parse.
+
+    Usa settings.parse_workers, limitado às CPUs disponíveis ao processo: em containers,
+    os.cpu_count() retorna as CPUs do host, não a cota do container.
+
+    Returns:
+        Número de workers (mínimo 1)
+    """
+    try:
+        available = len(os.sched_getaffinity(0))
+    except AttributeError:  # sched_getaffinity não existe no macOS/Windows
+        available = os.cpu_count() or 1
+    return max(1, min(settings.parse_workers, available))
+
+
+def get_parse_pool() -> ProcessPoolExecutor:
+    """
+    Retorna o pool de processos usado pelo parse do wikitext, criando-o se necessário.
+
+    Usa o contexto "spawn": o processo pai tem threads (Motor, dead letter logger)
+    e fazer fork nessas condições não é seguro.
+
+    Returns:
+        Instância compartilhada do ProcessPoolExecutor
+    """
+    global _parse_pool
+    if _parse_pool is None:
+        _parse_pool = ProcessPoolExecutor(
+            max_workers=parse_worker_count(),
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _parse_pool
+
+
+async def shutdown_parse_pool() -> None:
+    """
+    Encerra o pool de processos do parse, se tiver sido criado.
+
+    Chamado ao fim de cada execução do job, para não manter interpretadores ociosos no
+    processo web entre execuções. A espera pelos workers roda em outra thread, sem
+    bloquear o event loop.
+    """
+    global _parse_pool
+    pool, _parse_pool = _parse_pool, None
+    if pool is not None:
+        await asyncio.to_thread(pool.shutdown)
+
+
+def enable_eager_tasks() -> None:
+    """
+    Ativa o eager_task_factory no loop corrente, quando disponível (Python 3.12+).
+
+    Tasks cujo primeiro passo termina sem suspender (ex: wikitext em cache) são
+    concluídas na criação, sem passar por uma volta do event loop.
+    """
+    if hasattr(asyncio, "eager_task_factory"):
+        asyncio.get_running_loop().set_task_factory(asyncio.eager_task_factory)
 
 
 async def process_boss(
     client: TibiaWikiClient,
     boss_info: Dict,
-    semaphore: asyncio.Semaphore,
+    semaphore: Union[asyncio.Semaphore, AdaptiveLimiter],
 ) -> Optional[BossModel]:
     """
     Processa um único boss: busca wikitext e faz parse.
@@ -45,7 +113,7 @@ async def process_boss(
     Args:
         client: Instância do TibiaWikiClient
         boss_info: Dicionário com informações do boss (pageid, title)
-        semaphore: Semáforo para limitar requisições simultâneas
+        semaphore: Semáforo (ou AdaptiveLimiter) para limitar requisições simultâneas
 
     Returns:
         BossModel se processado com sucesso, None caso contrário
@@ -63,8 +131,11 @@ async def process_boss(
                 logger.warning(f"Wikitext não encontrado para: {boss_name}")
                 return None
 
-            # Faz o parse do wikitext (já extrai image_filename se disponível)
-            boss_model = WikitextParser.parse(wikitext, boss_name=boss_name)
+            # Faz o parse do wikitext em outro processo, sem bloquear o event loop
+            # (já extrai image_filename se disponível)
+            boss_model = await asyncio.get_running_loop().run_in_executor(
+                get_parse_pool(), WikitextParser.parse, wikitext, boss_name
+            )
 
             logger.debug(f"Processed {boss_name}")
             return boss_model
@@ -121,14 +192,11 @@ async def process_batch_with_images(
         logger.debug(f"Nenhuma imagem encontrada no lote de {len(bosses)} bosses")
         return bosses
 
-    # Remove duplicatas mantendo ordem
-    unique_filenames = list(dict.fromkeys(image_filenames))
+    logger.info(f"Resolvendo {len(image_filenames)} imagens para lote de {len(bosses)} bosses...")
 
-    logger.info(f"Resolvendo {len(unique_filenames)} imagens para lote de {len(bosses)} bosses...")
-
-    # Resolve URLs das imagens em lote
+    # Resolve URLs das imagens em lote (o resolver já remove duplicatas)
     try:
-        image_urls = await image_resolver.resolve_images(unique_filenames)
+        image_urls = await image_resolver.resolve_images(image_filenames)
     except Exception as e:
         logger.error(f"Erro ao resolver imagens: {e}")
         image_urls = {}
@@ -155,6 +223,7 @@ async def process_and_save_batch(
     bosses: List[BossModel],
     image_resolver: ImageResolverService,
     repository: BossRepository,
+    bulk_size: int = BULK_WRITE_SIZE,
 ) -> int:
     """
     Processa um lote de bosses: resolve imagens e salva no MongoDB.
@@ -163,6 +232,7 @@ async def process_and_save_batch(
         bosses: Lista de BossModel
         image_resolver: Instância do ImageResolverService
         repository: Instância do BossRepository
+        bulk_size: Número máximo de upserts por chamada ao bulk_write
 
     Returns:
         Número de bosses salvos com sucesso
@@ -174,7 +244,7 @@ async def process_and_save_batch(
     enriched_bosses = await process_batch_with_images(bosses, image_resolver)
 
     # Salva no MongoDB
-    success_count = await repository.upsert_batch(enriched_bosses)
+    success_count = await repository.upsert_batch(enriched_bosses, bulk_size=bulk_size)
 
     logger.info(f"Lote processado: {success_count}/{len(enriched_bosses)} bosses salvos")
     return success_count
@@ -182,6 +252,8 @@ async def process_and_save_batch(
 
 async def main():
     """Função principal do script orchestrator."""
+    enable_eager_tasks()
+
     logger.info("=" * 60)
     logger.info("Iniciando scraper de Bosses do TibiaWiki (Sprint 2)")
     logger.info("=" * 60)
@@ -195,10 +267,13 @@ async def main():
     repository = BossRepository(db)
     logger.info("✅ MongoDB conectado e índices criados")
 
-    # Cria semáforo para limitar requisições simultâneas
-    semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+    # Limita requisições simultâneas, ajustando o limite conforme as respostas (429/5xx)
+    semaphore = AdaptiveLimiter(MAX_CONCURRENT_REQUESTS)
 
-    async with TibiaWikiClient() as client, ImageResolverService() as image_resolver:
+    async with (
+        TibiaWikiClient(limiter=semaphore) as client,
+        ImageResolverService() as image_resolver,
+    ):
         # 1. Busca lista de todos os bosses
         logger.info("Buscando lista de todos os bosses...")
         bosses_list = await client.get_all_bosses()
@@ -211,16 +286,17 @@ async def main():
 
         tasks = [process_boss(client, boss_info, semaphore) for boss_info in bosses_list]
 
-        # Usa gather para processar em paralelo
-        results = await asyncio.gather(*tasks, return_exceptions=True)
-
-        # Filtra resultados válidos (remove None e exceções)
+        # Consome os resultados à medida que ficam prontos (sem esperar o mais lento)
         processed_bosses: List[BossModel] = []
-        for result in results:
+        for next_result in asyncio.as_completed(tasks):
+            try:
+                result = await next_result
+            except Exception as e:
+                logger.error(f"Exceção não tratada: {e}")
+                continue
+
             if isinstance(result, BossModel):
                 processed_bosses.append(result)
-            elif isinstance(result, Exception):
-                logger.error(f"Exceção não tratada: {result}")
 
         success_count = len(processed_bosses)
         failure_count = total_bosses - success_count
@@ -233,20 +309,13 @@ async def main():
         logger.info(f"  Falhas: {failure_count}")
         logger.info(f"  Taxa de sucesso: {success_rate:.1f}%")
 
-        # 3. Processa em lotes: resolve imagens e salva no MongoDB
+        # 3. Resolve imagens (o resolver já agrupa em lotes) e salva no MongoDB via bulk_write
         logger.info("-" * 60)
-        logger.info(f"Processando em lotes de {BATCH_SIZE} bosses...")
-
-        total_saved = 0
-        for i in range(0, len(processed_bosses), BATCH_SIZE):
-            batch = processed_bosses[i : i + BATCH_SIZE]
-            batch_num = (i // BATCH_SIZE) + 1
-            total_batches = (len(processed_bosses) + BATCH_SIZE - 1) // BATCH_SIZE
-
-            logger.info(f"Processando lote {batch_num}/{total_batches} ({len(batch)} bosses)...")
+        logger.info(f"Salvando {len(processed_bosses)} bosses (bulk de até {BULK_WRITE_SIZE})...")
 
-            saved = await process_and_save_batch(batch, image_resolver, repository)
-            total_saved += saved
+        total_saved = await process_and_save_batch(
+            processed_bosses, image_resolver, repository, bulk_size=BULK_WRITE_SIZE
+        )
 
         logger.info("-" * 60)
         logger.info(f"✅ Pipeline completo:")
@@ -260,7 +329,8 @@ async def main():
         else:
             logger.warning(f"⚠️  DoD: Taxa de sucesso {success_rate:.1f}% < 90%")
 
-    # Fecha conexão MongoDB
+    # Encerra os processos de parse e fecha conexão MongoDB
+    await shutdown_parse_pool()
     await close_database()
     logger.info("Conexão MongoDB fechada")
 
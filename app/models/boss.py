@@ -1,9 +1,22 @@
 """Modelo Pydantic para dados de Bosses do Tibia."""
 
 import re
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
-from pydantic import BaseModel, ConfigDict, field_validator
+from pydantic import BaseModel, ConfigDict, PrivateAttr, field_validator
+
+# Anotações entre parênteses (ex: "(estimated)", "(partial)")
+_PAREN_RE = re.compile(r"\([^)]*\)")
+
+# Sequências de dígitos restantes após a limpeza de valores numéricos
+_DIGITS_RE = re.compile(r"\d+")
+
+# Tabela de str.translate que remove vírgulas e espaços (ex: "50,000" -> "50000")
+_COMMA_SPACE_TABLE = str.maketrans("", "", ", ")
+
+# Normalização de slug: caracteres especiais e sequências de espaços/hífens
+_SLUG_INVALID_RE = re.compile(r"[^\w\s-]")
+_SLUG_SEPARATOR_RE = re.compile(r"[-\s]+")
 
 
 class BossVisuals(BaseModel):
@@ -51,6 +64,9 @@ class BossModel(BaseModel):
     bosstiary: Optional[BosstiaryStats] = None
     visuals: Optional[BossVisuals] = None
 
+    # Cache do slug gerado: (nome usado na geração, slug)
+    _slug_cache: Optional[Tuple[str, str]] = PrivateAttr(default=None)
+
     @field_validator("hp", mode="before")
     @classmethod
     def sanitize_hp(cls, v):
@@ -78,13 +94,18 @@ class BossModel(BaseModel):
                 return None
 
             # Remove parênteses e conteúdo dentro (ex: "(estimated)")
-            v = re.sub(r"\([^)]*\)", "", v).strip()
+            if "(" in v:
+                v = _PAREN_RE.sub("", v)
 
             # Remove vírgulas e espaços
-            v = v.replace(",", "").replace(" ", "")
+            v = v.translate(_COMMA_SPACE_TABLE)
+
+            # Caminho rápido: sobrou apenas um número
+            if v.isascii() and v.isdigit():
+                return int(v)
 
             # Tenta extrair apenas números
-            numbers = re.findall(r"\d+", v)
+            numbers = _DIGITS_RE.findall(v)
             if numbers:
                 return int("".join(numbers))
 
@@ -136,13 +157,13 @@ class BossModel(BaseModel):
             if v.lower() in ("none", "n/a", "???", ""):
                 return []
 
-            # Remove parênteses e conteúdo dentro
-            v = re.sub(r"\([^)]*\)", "", v).strip()
+            # Remove parênteses e conteúdo dentro (podem conter vírgulas,
+            # então a remoção acontece antes da divisão)
+            if "(" in v:
+                v = _PAREN_RE.sub("", v)
 
             # Divide por vírgula
-            items = [item.strip() for item in v.split(",") if item.strip()]
-
-            return items
+            return [item for item in map(str.strip, v.split(",")) if item]
 
         return []
 
@@ -177,7 +198,10 @@ class BossModel(BaseModel):
         """
         if self.slug:
             return self.slug
-        return self._generate_slug(self.name)
+        # O modelo não é frozen: o cache vale apenas enquanto o nome não mudar
+        if self._slug_cache is None or self._slug_cache[0] != self.name:
+            self._slug_cache = (self.name, self._generate_slug(self.name))
+        return self._slug_cache[1]
 
     @staticmethod
     def _generate_slug(name: str) -> str:
@@ -191,9 +215,9 @@ class BossModel(BaseModel):
             Slug gerado (ex: "Morgaroth" -> "morgaroth")
         """
         # Remove caracteres especiais, converte para minúsculas
-        slug = re.sub(r"[^\w\s-]", "", name.lower())
+        slug = _SLUG_INVALID_RE.sub("", name.lower())
         # Remove espaços extras e substitui por hífens
-        slug = re.sub(r"[-\s]+", "-", slug)
+        slug = _SLUG_SEPARATOR_RE.sub("-", slug)
         # Remove hífens no início e fim
         slug = slug.strip("-")
         return slug
@@ -8,13 +8,24 @@ T = TypeVar("T")
 
 
 class PaginatedResponse(BaseModel, Generic[T]):
-    """Resposta paginada genérica."""
+    """
+    Resposta paginada genérica.
+
+    Suporta dois modos:
+    - Por página (`page`): `page` e `pages` indicam a posição na listagem
+    - Por cursor (`after`): `page` e `pages` são null; use `next_after` na próxima requisição
+    """
 
     items: List[T]
     total: int
-    page: int
+    page: int | None
     size: int
-    pages: int
+    pages: int | None
+    # True quando total (e portanto pages) vem de uma estimativa, não de uma contagem exata
+    total_estimated: bool = False
+    # Slug do último item, para buscar a página seguinte com after=<next_after>
+    # (null quando não há mais itens ou o endpoint não suporta cursor)
+    next_after: str | None = None
     latest_update: str | None = None
 
     model_config = ConfigDict(
@@ -1,7 +1,8 @@
 """Serviço para resolver URLs de imagens do TibiaWiki usando Batch Strategy."""
 
 import logging
-from typing import Dict, List
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List
 
 import httpx
 
@@ -12,6 +13,7 @@ BATCH_SIZE = 50
 PLACEHOLDER_URL = "static/placeholder_boss.png"
 BASE_URL = "https://tibia.fandom.com/api.php"
 USER_AGENT = "TibiaBossApiBot/0.1 (contato@seuexemplo.com)"
+ACCEPT_ENCODING = "gzip, deflate"
 
 
 class ImageResolverService:
@@ -43,7 +45,7 @@ class ImageResolverService:
         if self._client is None:
             self._client = httpx.AsyncClient(
                 base_url=self.base_url,
-                headers={"User-Agent": USER_AGENT},
+                headers={"User-Agent": USER_AGENT, "Accept-Encoding": ACCEPT_ENCODING},
                 timeout=self.timeout,
             )
 
@@ -53,18 +55,20 @@ class ImageResolverService:
             await self._client.aclose()
             self._client = None
 
-    def _chunk_list(self, items: List[str], chunk_size: int) -> List[List[str]]:
+    def _chunk_list(self, items: Iterable[str], chunk_size: int) -> Iterator[List[str]]:
         """
-        Divide uma lista em chunks de tamanho específico.
+        Divide um iterável em chunks de tamanho específico, sob demanda.
 
         Args:
-            items: Lista de itens para dividir
+            items: Itens para dividir
             chunk_size: Tamanho de cada chunk
 
-        Returns:
-            Lista de chunks
+        Yields:
+            Listas com até chunk_size itens
         """
-        return [items[i: i + chunk_size] for i in range(0, len(items), chunk_size)]
+        iterator = iter(items)
+        while chunk := list(islice(iterator, chunk_size)):
+            yield chunk
 
     async def _resolve_batch(self, filenames: List[str]) -> Dict[str, str]:
         """
@@ -92,6 +96,7 @@ class ImageResolverService:
             "prop": "imageinfo",
             "iiprop": "url",
             "format": "json",
+            "formatversion": "2",
             "redirects": "1",
         }
 
@@ -106,7 +111,7 @@ class ImageResolverService:
 
             # Extrai as URLs das imagens
             query = data.get("query", {})
-            pages = query.get("pages", {})
+            pages = query.get("pages", [])
             redirects = query.get("redirects", [])
 
             # Mapa de redirecionamentos: from -> to
@@ -114,7 +119,7 @@ class ImageResolverService:
 
             # Mapeia as URLs encontradas nas páginas para seus títulos
             url_map = {}
-            for _, page_data in pages.items():
+            for page_data in pages:
                 title = page_data.get("title", "")
                 imageinfo = page_data.get("imageinfo", [])
 
@@ -180,19 +185,17 @@ class ImageResolverService:
         if not filenames:
             return {}
 
-        # Remove duplicatas mantendo a ordem
-        unique_filenames = list(dict.fromkeys(filenames))
-
-        # Divide em chunks de BATCH_SIZE
-        chunks = self._chunk_list(unique_filenames, BATCH_SIZE)
+        # Remove duplicatas mantendo a ordem (lotes determinísticos entre execuções)
+        unique_filenames = dict.fromkeys(filenames)
+        total_chunks = -(-len(unique_filenames) // BATCH_SIZE)
 
-        logger.info("Resolvendo %d imagens em %d lote(s)", len(unique_filenames), len(chunks))
+        logger.info("Resolvendo %d imagens em %d lote(s)", len(unique_filenames), total_chunks)
 
         # Processa cada chunk
         all_results: Dict[str, str] = {}
 
-        for i, chunk in enumerate(chunks, 1):
-            logger.debug("Processando lote %d/%d (%d imagens)", i, len(chunks), len(chunk))
+        for i, chunk in enumerate(self._chunk_list(unique_filenames, BATCH_SIZE), 1):
+            logger.debug("Processando lote %d/%d (%d imagens)", i, total_chunks, len(chunk))
 
             try:
                 batch_results = await self._resolve_batch(chunk)
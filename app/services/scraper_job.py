@@ -12,37 +12,49 @@ from app.core.database import get_database
 from app.db.repository import BossRepository
 from app.db.system_jobs import SystemJobsRepository
 from app.main_scraper import (
-    BATCH_SIZE,
+    BULK_WRITE_SIZE,
     MAX_CONCURRENT_REQUESTS,
     process_and_save_batch,
     process_batch_with_images,
     process_boss,
+    shutdown_parse_pool,
 )
+from app.models.boss import BossModel
 from app.services.image_resolver import ImageResolverService
 from app.services.tibiawiki_client import TibiaWikiClient
+from app.utils.adaptive_limiter import AdaptiveLimiter
 from app.utils.dead_letter_logger import dead_letter_logger
 
 logger = logging.getLogger(__name__)
 
+# Evita o round-trip de ensure_scraper_lock_document a cada execução
+_scraper_lock_ensured = False
+
 
 async def run_scraper_job() -> None:
     """
     Executa o job de scraping completo respeitando o Mongo Mutex.
 
-    - Garante a existência do documento de lock
+    - Garante a existência do documento de lock (uma vez por processo)
     - Tenta adquirir o lock (status: idle -> running)
     - Se não conseguir, aborta silenciosamente
     - Em caso de sucesso, executa a pipeline de scraping
     - No finally, libera o lock (status: running -> idle, atualiza last_run)
     """
+    global _scraper_lock_ensured
+
     db = get_database()
     system_jobs_repo = SystemJobsRepository(db)
 
-    # Garante documento base do lock
-    await system_jobs_repo.ensure_scraper_lock_document()
+    # Garante documento base do lock (apenas na primeira execução do processo)
+    if not _scraper_lock_ensured:
+        await system_jobs_repo.ensure_scraper_lock_document()
+        _scraper_lock_ensured = True
 
     # Tenta adquirir o lock
     if not await system_jobs_repo.acquire_scraper_lock():
+        # O documento pode ter sido removido; revalida na próxima execução
+        _scraper_lock_ensured = False
         logger.info("Job already running - abortando nova execução do scraper")
         return
 
@@ -53,10 +65,13 @@ async def run_scraper_job() -> None:
 
         repository = BossRepository(db)
 
-        # Cria semáforo para limitar requisições simultâneas
-        semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+        # Limita requisições simultâneas, ajustando o limite conforme as respostas (429/5xx)
+        semaphore = AdaptiveLimiter(MAX_CONCURRENT_REQUESTS)
 
-        async with TibiaWikiClient() as client, ImageResolverService() as image_resolver:
+        async with (
+            TibiaWikiClient(limiter=semaphore) as client,
+            ImageResolverService() as image_resolver,
+        ):
             # 1. Busca lista de todos os bosses
             logger.info("Buscando lista de todos os bosses...")
             bosses_list = await client.get_all_bosses()
@@ -72,22 +87,22 @@ async def run_scraper_job() -> None:
 
             tasks = [process_boss(client, boss_info, semaphore) for boss_info in bosses_list]
 
-            results = await asyncio.gather(*tasks, return_exceptions=True)
-
-            # Filtra resultados válidos (remove None e exceções)
+            # Consome os resultados à medida que ficam prontos (sem lista intermediária)
             processed_bosses = []
-            for result in results:
-                from app.models.boss import BossModel  # import local para evitar ciclos
-
-                if isinstance(result, BossModel):
-                    processed_bosses.append(result)
-                elif isinstance(result, Exception):
-                    logger.error("Exceção não tratada: %s", result)
+            for next_result in asyncio.as_completed(tasks):
+                try:
+                    result = await next_result
+                except Exception as exc:  # noqa: BLE001
+                    logger.error("Exceção não tratada: %s", exc)
                     dead_letter_logger.log_parsing_error(
                         boss_name="unknown",
-                        error=result,
+                        error=exc,
                         raw_data=None,
                     )
+                    continue
+
+                if isinstance(result, BossModel):
+                    processed_bosses.append(result)
 
             success_count = len(processed_bosses)
             failure_count = total_bosses - success_count
@@ -100,30 +115,21 @@ async def run_scraper_job() -> None:
             logger.info("  Falhas: %s", failure_count)
             logger.info("  Taxa de sucesso: %.1f%%", success_rate)
 
-            # 3. Processa em lotes: resolve imagens e salva no MongoDB
+            # 3. Resolve imagens e salva no MongoDB com bulk_write
             logger.info("-" * 60)
-            logger.info("Processando em lotes de %s bosses...", BATCH_SIZE)
-
-            total_saved = 0
-            for i in range(0, len(processed_bosses), BATCH_SIZE):
-                batch = processed_bosses[i : i + BATCH_SIZE]
-                batch_num = (i // BATCH_SIZE) + 1
-                total_batches = (len(processed_bosses) + BATCH_SIZE - 1) // BATCH_SIZE
-
-                logger.info(
-                    "Processando lote %s/%s (%s bosses)...",
-                    batch_num,
-                    total_batches,
-                    len(batch),
-                )
-
-                # Reutiliza a função de main_scraper para enriquecer e salvar
-                saved = await process_and_save_batch(
-                    batch,
-                    image_resolver=image_resolver,
-                    repository=repository,
-                )
-                total_saved += saved
+            logger.info(
+                "Salvando %s bosses (bulk de até %s)...",
+                len(processed_bosses),
+                BULK_WRITE_SIZE,
+            )
+
+            # Reutiliza a função de main_scraper para enriquecer e salvar
+            total_saved = await process_and_save_batch(
+                processed_bosses,
+                image_resolver=image_resolver,
+                repository=repository,
+                bulk_size=BULK_WRITE_SIZE,
+            )
 
             logger.info("-" * 60)
             logger.info("✅ Job de sincronização completo:")
@@ -139,5 +145,7 @@ async def run_scraper_job() -> None:
     except Exception as exc:  # noqa: BLE001
         logger.exception("Erro ao executar job de sincronização: %s", exc)
     finally:
+        # Não mantém processos de parse ociosos no servidor entre execuções
+        await shutdown_parse_pool()
         # Garante liberação do lock mesmo em caso de erro
         await system_jobs_repo.release_scraper_lock()
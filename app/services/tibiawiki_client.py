@@ -1,11 +1,19 @@
 """Cliente assíncrono para comunicação com a API do TibiaWiki."""
 
 import asyncio
+import contextlib
 import logging
+import os
+import random
+from collections import OrderedDict
+from pathlib import Path
 from typing import Any, Dict, List, Optional
+from urllib.parse import quote
 
 import httpx
 
+from app.utils.adaptive_limiter import AdaptiveLimiter
+
 logger = logging.getLogger(__name__)
 
 
@@ -14,20 +22,51 @@ class TibiaWikiClient:
 
     BASE_URL = "https://tibia.fandom.com/api.php"
     USER_AGENT = "TibiaBossApiBot/0.1 (contato@seuexemplo.com)"
+    # httpx descomprime gzip/deflate nativamente; "br" exigiria o pacote brotli
+    ACCEPT_ENCODING = "gzip, deflate"
     MAX_RETRIES = 3
     INITIAL_BACKOFF = 1  # segundos
-
-    def __init__(self, base_url: Optional[str] = None, timeout: float = 30.0):
+    MAX_BACKOFF = 60  # segundos
+    # Fator aleatório aplicado à espera para dessincronizar workers concorrentes
+    BACKOFF_JITTER = (0.8, 1.4)
+    # Com Retry-After o jitter só alonga a espera: nunca antes do que o servidor pediu
+    RETRY_AFTER_JITTER = (1.0, 1.4)
+    # Pool de conexões reaproveitado por todas as chamadas do cliente
+    MAX_CONNECTIONS = 100
+    MAX_KEEPALIVE_CONNECTIONS = 10
+    CONNECT_TIMEOUT = 10.0  # segundos
+    # Máximo de páginas mantidas no cache de wikitext em memória
+    WIKITEXT_CACHE_SIZE = 4096
+    # Variável de ambiente que ativa o cache de wikitext em disco (ex: ".cache/wikitext")
+    CACHE_DIR_ENV = "TIBIAWIKI_CACHE_DIR"
+
+    def __init__(
+        self,
+        base_url: Optional[str] = None,
+        timeout: float = 30.0,
+        cache_dir: Optional[str] = None,
+        limiter: Optional[AdaptiveLimiter] = None,
+    ):
         """
         Inicializa o cliente TibiaWiki.
 
         Args:
             base_url: URL base da API (padrão: BASE_URL)
             timeout: Timeout para requisições HTTP em segundos
+            cache_dir: Diretório do cache de wikitext em disco (padrão: variável
+                TIBIAWIKI_CACHE_DIR; desativado se nenhum dos dois for definido)
+            limiter: Limitador adaptativo que recebe o status de cada resposta
         """
         self.base_url = base_url or self.BASE_URL
         self.timeout = timeout
         self._client: Optional[httpx.AsyncClient] = None
+        self.limiter = limiter
+
+        # Cache LRU de wikitext por página, válido durante a vida do cliente
+        self._wikitext_cache: "OrderedDict[str, str]" = OrderedDict()
+
+        cache_dir = cache_dir or os.environ.get(self.CACHE_DIR_ENV)
+        self.cache_dir: Optional[Path] = Path(cache_dir) if cache_dir else None
 
     async def __aenter__(self):
         """Context manager entry."""
@@ -43,8 +82,15 @@ class TibiaWikiClient:
         if self._client is None:
             self._client = httpx.AsyncClient(
                 base_url=self.base_url,
-                headers={"User-Agent": self.USER_AGENT},
-                timeout=self.timeout,
+                headers={
+                    "User-Agent": self.USER_AGENT,
+                    "Accept-Encoding": self.ACCEPT_ENCODING,
+                },
+                timeout=httpx.Timeout(self.timeout, connect=self.CONNECT_TIMEOUT),
+                limits=httpx.Limits(
+                    max_connections=self.MAX_CONNECTIONS,
+                    max_keepalive_connections=self.MAX_KEEPALIVE_CONNECTIONS,
+                ),
             )
 
     async def close(self):
@@ -69,22 +115,29 @@ class TibiaWikiClient:
             httpx.HTTPStatusError: Se a requisição falhar após todas as tentativas
         """
         await self._ensure_client()
-        backoff = self.INITIAL_BACKOFF
 
         for attempt in range(self.MAX_RETRIES):
             try:
                 response = await self._client.request(method, url, **kwargs)
+                if self.limiter is not None:
+                    self.limiter.report(response.status_code)
                 response.raise_for_status()
                 return response
             except httpx.HTTPStatusError as e:
                 if e.response.status_code == 429:
                     if attempt < self.MAX_RETRIES - 1:
-                        wait_time = backoff * (2**attempt)
+                        retry_after = self._parse_retry_after(e.response)
+                        if retry_after:
+                            base_wait = retry_after
+                            jitter = random.uniform(*self.RETRY_AFTER_JITTER)
+                        else:
+                            base_wait = self.INITIAL_BACKOFF * (2**attempt)
+                            jitter = random.uniform(*self.BACKOFF_JITTER)
+                        wait_time = min(base_wait * jitter, self.MAX_BACKOFF)
                         logger.warning(
-                            f"Rate limit (429) atingido. Aguardando {wait_time}s antes de tentar novamente..."
+                            f"Rate limit (429) atingido. Aguardando {wait_time:.1f}s antes de tentar novamente..."
                         )
                         await asyncio.sleep(wait_time)
-                        backoff = wait_time
                         continue
                     else:
                         logger.error(f"Rate limit (429) após {self.MAX_RETRIES} tentativas")
@@ -95,52 +148,95 @@ class TibiaWikiClient:
                 logger.error(f"Erro na requisição: {e}")
                 raise
 
+    @staticmethod
+    def _parse_retry_after(response: httpx.Response) -> Optional[float]:
+        """
+        Lê o header Retry-After (em segundos) de uma resposta 429.
+
+        Args:
+            response: Resposta HTTP recebida
+
+        Returns:
+            Segundos de espera sugeridos pelo servidor ou None se ausente/inválido
+        """
+        value = response.headers.get("Retry-After")
+        if value is None:
+            return None
+        try:
+            seconds = float(value)
+        except (TypeError, ValueError):
+            # Formato HTTP-date não é tratado; usa o backoff exponencial
+            return None
+        return seconds if seconds > 0 else None
+
     async def get_all_bosses(self) -> List[Dict[str, Any]]:
         """
         Busca todos os bosses da categoria Category:Bosses.
 
-        Lida automaticamente com paginação usando cmcontinue.
+        Lida automaticamente com paginação usando cmcontinue. Assim que uma página
+        chega, a requisição da próxima é disparada antes de processar a atual.
 
         Returns:
             Lista de dicionários contendo informações dos bosses (pageid, title, etc.)
         """
-        all_bosses = []
-        cmcontinue = None
+        all_bosses: List[Dict[str, Any]] = []
+        data = (await self._fetch_bosses_page(None)).json()
+        next_page: Optional[asyncio.Task] = None
 
-        while True:
-            params: Dict[str, Any] = {
-                "action": "query",
-                "list": "categorymembers",
-                "cmtitle": "Category:Bosses",
-                "cmlimit": 500,
-                "cmnamespace": 0,  # Apenas artigos principais (ignora arquivos, categorias, etc.)
-                "cmtype": "page",  # Garante que só pega páginas
-                "format": "json",
-            }
+        try:
+            while True:
+                cmcontinue = data.get("continue", {}).get("cmcontinue")
 
-            if cmcontinue:
-                params["cmcontinue"] = cmcontinue
+                # Dispara a próxima página enquanto a atual é processada
+                next_page = (
+                    asyncio.create_task(self._fetch_bosses_page(cmcontinue)) if cmcontinue else None
+                )
 
-            logger.info(f"Buscando bosses... (já encontrados: {len(all_bosses)})")
+                query = data.get("query", {})
+                all_bosses.extend(query.get("categorymembers", []))
+                logger.info(f"Buscando bosses... (já encontrados: {len(all_bosses)})")
 
-            response = await self._request_with_backoff("GET", "", params=params)
-            data = response.json()
-
-            query = data.get("query", {})
-            categorymembers = query.get("categorymembers", [])
-            all_bosses.extend(categorymembers)
-
-            # Verifica se há mais páginas
-            if "continue" in data:
-                cmcontinue = data["continue"].get("cmcontinue")
-                if not cmcontinue:
+                if next_page is None:
                     break
-            else:
-                break
+
+                data = (await next_page).json()
+        finally:
+            # Em caso de erro, não deixa a próxima página pendente (nem o erro dela sem
+            # ser lido, o que geraria "Task exception was never retrieved")
+            if next_page is not None:
+                next_page.cancel()
+                with contextlib.suppress(asyncio.CancelledError, Exception):
+                    await next_page
 
         logger.info(f"Total de bosses encontrados: {len(all_bosses)}")
         return all_bosses
 
+    async def _fetch_bosses_page(self, cmcontinue: Optional[str]) -> httpx.Response:
+        """
+        Busca uma página da listagem de Category:Bosses.
+
+        Args:
+            cmcontinue: Token de continuação da página anterior (None para a primeira)
+
+        Returns:
+            Resposta HTTP da página solicitada
+        """
+        params: Dict[str, Any] = {
+            "action": "query",
+            "list": "categorymembers",
+            "cmtitle": "Category:Bosses",
+            "cmlimit": 500,
+            "cmnamespace": 0,  # Apenas artigos principais (ignora arquivos, categorias, etc.)
+            "cmtype": "page",  # Garante que só pega páginas
+            "format": "json",
+            "formatversion": "2",
+        }
+
+        if cmcontinue:
+            params["cmcontinue"] = cmcontinue
+
+        return await self._request_with_backoff("GET", "", params=params)
+
     async def get_boss_wikitext(
         self, pageid: Optional[int] = None, title: Optional[str] = None
     ) -> Optional[str]:
@@ -160,12 +256,84 @@ class TibiaWikiClient:
         if not pageid and not title:
             raise ValueError("Deve fornecer pageid ou title")
 
+        cache_key = f"pageid-{pageid}" if pageid else f"title-{quote(title, safe='')}"
+
+        content = self._get_cached_wikitext(cache_key)
+        if content is not None:
+            logger.debug(f"Wikitext em cache: pageid={pageid}, title={title}")
+            return content
+
+        content = await self._fetch_boss_wikitext(pageid, title)
+        if content is not None:
+            self._cache_wikitext(cache_key, content)
+
+        return content
+
+    def _get_cached_wikitext(self, cache_key: str) -> Optional[str]:
+        """
+        Busca o wikitext no cache em memória e, se ativado, no cache em disco.
+
+        Args:
+            cache_key: Chave da página (pageid ou título)
+
+        Returns:
+            Wikitext em cache ou None se não encontrado
+        """
+        content = self._wikitext_cache.get(cache_key)
+        if content is not None:
+            self._wikitext_cache.move_to_end(cache_key)
+            return content
+
+        if self.cache_dir is not None:
+            try:
+                content = (self.cache_dir / f"{cache_key}.txt").read_text(encoding="utf-8")
+            except FileNotFoundError:
+                return None
+            self._cache_wikitext(cache_key, content, persist=False)
+
+        return content
+
+    def _cache_wikitext(self, cache_key: str, content: str, persist: bool = True):
+        """
+        Guarda o wikitext no cache em memória e, se ativado, no cache em disco.
+
+        Args:
+            cache_key: Chave da página (pageid ou título)
+            content: Wikitext da página
+            persist: Se True, também grava no cache em disco
+        """
+        self._wikitext_cache[cache_key] = content
+        self._wikitext_cache.move_to_end(cache_key)
+        if len(self._wikitext_cache) > self.WIKITEXT_CACHE_SIZE:
+            self._wikitext_cache.popitem(last=False)
+
+        if persist and self.cache_dir is not None:
+            try:
+                self.cache_dir.mkdir(parents=True, exist_ok=True)
+                (self.cache_dir / f"{cache_key}.txt").write_text(content, encoding="utf-8")
+            except OSError as e:
+                logger.warning(f"Erro ao gravar cache de wikitext {cache_key}: {e}")
+
+    async def _fetch_boss_wikitext(
+        self, pageid: Optional[int], title: Optional[str]
+    ) -> Optional[str]:
+        """
+        Busca o wikitext de uma página na API (sem cache).
+
+        Args:
+            pageid: ID da página (prioritário se fornecido)
+            title: Título da página (usado se pageid não fornecido)
+
+        Returns:
+            String com o conteúdo wikitext ou None se não encontrado
+        """
         params: Dict[str, Any] = {
             "action": "query",
             "prop": "revisions",
             "rvprop": "content",
             "rvslots": "main",
             "format": "json",
+            "formatversion": "2",  # pages como lista e conteúdo em slots.main.content
         }
 
         if pageid:
@@ -179,25 +347,25 @@ class TibiaWikiClient:
         data = response.json()
 
         query = data.get("query", {})
-        pages = query.get("pages", {})
+        pages = query.get("pages", [])
 
-        # Se usou pageid, busca pela chave do pageid
-        if pageid:
-            page_data = pages.get(str(pageid))
-        else:
-            # Se usou title, precisa encontrar a chave da página
-            page_data = None
-            for page_key, page_info in pages.items():
-                if page_info.get("title") == title:
+        # Com formatversion=2, pages é uma lista; busca por pageid ou title
+        page_data = None
+        for page_info in pages:
+            if pageid:
+                if page_info.get("pageid") == pageid:
                     page_data = page_info
                     break
+            elif page_info.get("title") == title:
+                page_data = page_info
+                break
 
         if not page_data:
             logger.warning(f"Página não encontrada: pageid={pageid}, title={title}")
             return None
 
         # Verifica se a página foi encontrada mas está vazia (página não existe)
-        if "missing" in page_data:
+        if page_data.get("missing"):
             logger.warning(f"Página não existe: pageid={pageid}, title={title}")
             return None
 
@@ -206,5 +374,5 @@ class TibiaWikiClient:
             logger.warning(f"Nenhuma revisão encontrada: pageid={pageid}, title={title}")
             return None
 
-        content = revisions[0].get("slots", {}).get("main", {}).get("*")
+        content = revisions[0].get("slots", {}).get("main", {}).get("content")
         return content
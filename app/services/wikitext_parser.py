@@ -2,7 +2,7 @@
 
 import logging
 import re
-from typing import Optional
+from typing import Dict, List, Optional, Tuple, Union
 
 import mwparserfromhell
 
@@ -10,6 +10,46 @@ from app.models.boss import BossModel
 
 logger = logging.getLogger(__name__)
 
+# Padrão único usado por _clean_wiki_text: [[links]], <br> e demais tags HTML
+_CLEAN_RE = re.compile(
+    r"(?P<link>\[\[(?:[^|\]]*\|)?(?P<text>[^\]]+)\]\])|(?P<br><br\s*/?>)|(?P<tag><[^>]+>)",
+    re.IGNORECASE,
+)
+
+# Variações de nome de template contendo "infobox" e "boss" (em qualquer ordem)
+_INFOBOX_BOSS_FALLBACK_RE = re.compile(r"(?=.*infobox)(?=.*boss)", re.DOTALL)
+
+# Tokens estruturais de um template lidos pelo scanner (_scan_template); "{{{", comentários,
+# <ref> e <nowiki> não são tratados pelo scanner e levam ao parse completo
+_TEMPLATE_TOKEN_RE = re.compile(r"(?P<full>\{\{\{|<!--|(?i:<ref|<nowiki))|\{\{|\}\}|\[\[|\]\]|[|=]")
+
+# Retorno de _scan_template quando o template precisa do parse completo do mwparserfromhell
+_FULL_PARSE = object()
+
+# Pontos de interesse fora dos templates: início de template, comentário ou <nowiki>
+_OUTER_TOKEN_RE = re.compile(r"\{\{|<!--|(?i:<nowiki)")
+
+# Nome (parcial) de um template, até o primeiro "|", "{" ou "}"
+_TEMPLATE_NAME_RE = re.compile(r"\{\{([^{}|]*)")
+
+# Tudo que não é dígito (ex: "120%" -> "120") nas resistências
+_NON_DIGIT_RE = re.compile(r"[^\d]")
+
+# Nome de arquivo de imagem: ignora [[, prefixos File:/Image: e parâmetros após "|"
+_IMAGE_RE = re.compile(r"^\[{0,2}(?::?(?:File|Image):)?([^|\]]+)", re.IGNORECASE)
+
+
+def _clean_sub(match: "re.Match[str]") -> str:
+    """Retorna a substituição de _CLEAN_RE conforme o grupo encontrado."""
+    kind = match.lastgroup
+    if kind == "link":
+        text = match.group("text")
+        # O texto do link pode conter tags (ex: [[Fire|Fire<br>]])
+        return _CLEAN_RE.sub(_clean_sub, text) if "<" in text else text
+    if kind == "br":
+        return ", "
+    return ""
+
 
 class ParserError(Exception):
     """Exceção lançada quando o parser não consegue processar o wikitext."""
@@ -23,6 +63,73 @@ class WikitextParser:
     INFOBOX_BOSS_TEMPLATE = "Infobox Boss"
     INFOBOX_CREATURE_TEMPLATE = "Infobox Creature"
 
+    # Mapeia os parâmetros do template (minúsculos) para os campos do modelo
+    _FIELD_MAPPING: Dict[str, str] = {
+        "name": "name",
+        "hp": "hp",
+        "hitpoints": "hp",
+        "health": "hp",
+        "exp": "exp",
+        "experience": "exp",
+        "xp": "exp",
+        "speed": "speed",
+        "implemented": "version",
+        "version": "version",
+        "location": "location",
+        "loc": "location",
+        "abilities": "abilities",
+        "sounds": "sounds",
+        "loot": "loot",
+        "walks through": "walks_through",
+        "walksthrough": "walks_through",
+        "walks_through": "walks_through",
+        "weak to": "elemental_weaknesses",
+        "weakness": "elemental_weaknesses",
+        "weak": "elemental_weaknesses",
+        "strong to": "elemental_resistances",
+        "resistance": "elemental_resistances",
+        "resistant": "elemental_resistances",
+        "immunities": "immunities",
+        "immunity": "immunities",
+        "immune": "immunities",
+        "immune to": "immunities",
+        "bosstiaryclass": "bosstiary_class",
+        "image": "image",
+        "imag": "image",
+        "img": "image",
+        "picture": "image",
+    }
+
+    # Pares (parâmetro, campo) pré-materializados para o laço de extração; a busca por
+    # parâmetro é exata, então o acesso ao dict já normalizado é O(1) por entrada
+    _FIELD_ITEMS = tuple(_FIELD_MAPPING.items())
+
+    # Campos do modelo que acumulam múltiplos valores (listas)
+    _LIST_FIELDS = frozenset(
+        {
+            "abilities",
+            "sounds",
+            "loot",
+            "walks_through",
+            "elemental_weaknesses",
+            "elemental_resistances",
+            "immunities",
+        }
+    )
+
+    # Campos de resistência percentual (específicos)
+    _RESISTANCE_FIELDS = (
+        "physical",
+        "earth",
+        "fire",
+        "ice",
+        "energy",
+        "death",
+        "holy",
+        "drown",
+        "hpdrain",
+    )
+
     @classmethod
     def parse(cls, wikitext: str, boss_name: Optional[str] = None) -> BossModel:
         """
@@ -41,72 +148,261 @@ class WikitextParser:
         if not wikitext:
             raise ParserError("Wikitext vazio fornecido")
 
+        # Pré-filtro barato: sem "{{" ou sem "infobox" não há template a encontrar
+        # (redirects e stubs), então evita o parse completo do mwparserfromhell.
+        # lower() + "in" é ~10x mais rápido que uma busca regex com IGNORECASE aqui
+        # A mensagem segue o formato do caminho completo (dead letter consistente entre os dois)
+        if "{{" not in wikitext or "infobox" not in wikitext.lower():
+            raise cls._unexpected_error(cls._infobox_not_found_message())
+
         try:
-            # Parse do wikitext usando mwparserfromhell
-            wikicode = mwparserfromhell.parse(wikitext)
+            # Caminho rápido: scanner de templates em uma única passada
+            params = cls._scan_infobox(wikitext)
 
-            # Busca pelo template Infobox Boss ou Infobox Creature
-            infobox = cls._find_infobox_boss(wikicode)
+            if params is None:
+                # Salvaguarda: confirma com o parse completo do mwparserfromhell
+                params = cls._find_infobox_boss(mwparserfromhell.parse(wikitext))
 
-            if not infobox:
-                raise ParserError(
-                    f"Template '{cls.INFOBOX_BOSS_TEMPLATE}' ou '{cls.INFOBOX_CREATURE_TEMPLATE}' não encontrado no wikitext"
-                )
+            if params is None:
+                raise ParserError(cls._infobox_not_found_message())
 
             # Extrai os dados do template (já retorna BossModel com image_filename)
-            return cls._extract_template_data(infobox, boss_name)
+            return cls._extract_template_data(params, boss_name)
 
         except mwparserfromhell.parser.ParserError as e:
             logger.error(f"Erro ao fazer parse do wikitext: {e}")
             raise ParserError(f"Erro ao fazer parse do wikitext: {e}") from e
         except Exception as e:
-            logger.error(f"Erro inesperado ao processar wikitext: {e}")
-            raise ParserError(f"Erro inesperado ao processar wikitext: {e}") from e
+            raise cls._unexpected_error(e) from e
+
+    @staticmethod
+    def _unexpected_error(error: object) -> ParserError:
+        """
+        Registra e monta o ParserError padrão para falhas ao processar o wikitext.
+
+        Args:
+            error: Exceção (ou mensagem) de origem
+
+        Returns:
+            ParserError com a mensagem "Erro inesperado ao processar wikitext: ..."
+        """
+        logger.error(f"Erro inesperado ao processar wikitext: {error}")
+        return ParserError(f"Erro inesperado ao processar wikitext: {error}")
 
     @classmethod
-    def _find_infobox_boss(cls, wikicode: mwparserfromhell.wikicode.Wikicode):
+    def _infobox_not_found_message(cls) -> str:
+        """Mensagem de erro usada quando nenhum infobox de boss é encontrado."""
+        return (
+            f"Template '{cls.INFOBOX_BOSS_TEMPLATE}' ou '{cls.INFOBOX_CREATURE_TEMPLATE}' "
+            "não encontrado no wikitext"
+        )
+
+    @classmethod
+    def _template_params(cls, template) -> Dict[str, str]:
         """
-        Encontra o template Infobox Boss no wikicode.
+        Normaliza os parâmetros de um template em uma única passada.
 
         Args:
-            wikicode: Objeto Wikicode parseado
+            template: Template do mwparserfromhell
+
+        Returns:
+            Dicionário nome do parâmetro (minúsculo) -> valor (sem espaços nas bordas)
+        """
+        params: Dict[str, str] = {}
+        for param in template.params:
+            if param.name:
+                cls._add_param(params, str(param.name), str(param.value))
+        return params
+
+    @classmethod
+    def _add_param(cls, params: Dict[str, str], name: str, value: str):
+        """
+        Adiciona um parâmetro normalizado, tratando nomes repetidos no template.
+
+        Valores vazios não sobrescrevem um valor anterior; parâmetros de lista repetidos
+        (ex: dois "immunities") são concatenados com ", "; os demais ficam com o último valor.
+
+        Args:
+            params: Parâmetros já normalizados (alterado in place)
+            name: Nome do parâmetro como aparece no template
+            value: Valor do parâmetro como aparece no template
+        """
+        key = name.strip().lower()
+        value = value.strip()
+        previous = params.get(key)
+        if previous and not value:
+            return
+        if previous and cls._FIELD_MAPPING.get(key) in cls._LIST_FIELDS:
+            value = f"{previous}, {value}"
+        params[key] = value
+
+    @classmethod
+    def _is_boss_infobox(cls, template_name: str, params: Dict[str, str]) -> bool:
+        """
+        Verifica se um template é o infobox de um boss.
+
+        Args:
+            template_name: Nome do template normalizado (sem espaços nas bordas, minúsculo)
+            params: Parâmetros normalizados do template
+
+        Returns:
+            True se o template descreve um boss
+        """
+        # Verifica se é o template Infobox Boss
+        if template_name == cls.INFOBOX_BOSS_TEMPLATE.lower():
+            return True
+
+        # Verifica se é o template Infobox Creature (usado para bosses também)
+        if template_name == cls.INFOBOX_CREATURE_TEMPLATE.lower():
+            # É um boss se tiver isboss = yes ou, caso contrário, campos hp/exp
+            if params.get("isboss", "").lower() == "yes" or any(
+                key in params for key in ("hp", "exp", "hitpoints", "experience", "xp")
+            ):
+                return True
+
+        # Também verifica variações comuns
+        return bool(_INFOBOX_BOSS_FALLBACK_RE.match(template_name))
+
+    @classmethod
+    def _scan_infobox(cls, wikitext: str) -> Optional[Dict[str, str]]:
+        """
+        Encontra o infobox do boss sem construir a árvore completa do wikitext.
+
+        Percorre as ocorrências de "{{" na ordem do documento (incluindo templates
+        aninhados, como o filter_templates do mwparserfromhell), pulando comentários
+        HTML, e só lê por completo os templates cujo nome contém "infobox".
+
+        Args:
+            wikitext: String com o conteúdo wikitext
 
         Returns:
-            Template encontrado ou None
+            Parâmetros normalizados do infobox ou None se não encontrado ou se o wikitext
+            tem construções que só o parse completo trata (<nowiki>, comentários, <ref>
+            e "{{{" no template)
         """
-        templates = wikicode.filter_templates()
+        pos = 0
+        while True:
+            match = _OUTER_TOKEN_RE.search(wikitext, pos)
+            if match is None:
+                return None
+            token = match.group()
+            pos = match.start()
+
+            if token == "<!--":
+                # Templates comentados não existem para o mwparserfromhell
+                close = wikitext.find("-->", match.end())
+                if close < 0:
+                    return None
+                pos = close + 3
+                continue
+            if token != "{{":
+                # <nowiki> fora de template: deixa para o parse completo
+                return None
+
+            name_match = _TEMPLATE_NAME_RE.match(wikitext, pos)
+            if "infobox" in name_match.group(1).lower():
+                scanned = cls._scan_template(wikitext, pos)
+                if scanned is _FULL_PARSE:
+                    return None
+                if scanned is not None:
+                    template_name, params = scanned
+                    if cls._is_boss_infobox(template_name, params):
+                        return params
+            pos += 2
+
+    @classmethod
+    def _scan_template(
+        cls, text: str, start: int
+    ) -> Union[None, object, Tuple[str, Dict[str, str]]]:
+        """
+        Lê o template que começa em text[start] ("{{") até o "}}" correspondente.
+
+        Controla a profundidade de {{ }} e [[ ]] para separar os parâmetros apenas
+        nos "|" de nível superior, usa o primeiro "=" de nível superior como separador
+        nome/valor e numera os parâmetros posicionais.
+
+        Args:
+            text: Wikitext completo
+            start: Posição do "{{" de abertura
+
+        Returns:
+            Tupla (nome normalizado, parâmetros normalizados), None se o template não fecha
+            ou _FULL_PARSE se o corpo tem comentários, <ref>, <nowiki> ou "{{{"
+        """
+        depth = 0  # templates aninhados abertos
+        links = 0  # [[links]] abertos
+        segment_start = start + 2
+        equals = -1
+        # (início, posição do "=" ou -1, fim) de cada trecho separado por "|"
+        segments: List[Tuple[int, int, int]] = []
+        pos = segment_start
+
+        while True:
+            match = _TEMPLATE_TOKEN_RE.search(text, pos)
+            if match is None:
+                return None
+            token = match.group()
+            pos = match.end()
+
+            if match.lastgroup == "full":
+                return _FULL_PARSE
+            if token == "{{":
+                depth += 1
+            elif token == "}}":
+                if not depth:
+                    segments.append((segment_start, equals, match.start()))
+                    break
+                depth -= 1
+            elif token == "[[":
+                links += 1
+            elif token == "]]":
+                if links:
+                    links -= 1
+            elif depth or links:
+                continue
+            elif token == "|":
+                segments.append((segment_start, equals, match.start()))
+                segment_start = pos
+                equals = -1
+            elif equals < 0:
+                equals = match.start()
+
+        name_start, _, name_end = segments[0]
+        params: Dict[str, str] = {}
+        positional = 0
+        for segment_start, equals, segment_end in segments[1:]:
+            if equals >= 0:
+                key = text[segment_start:equals]
+                if not key:
+                    continue
+                value = text[equals + 1 : segment_end]
+            else:
+                positional += 1
+                key = str(positional)
+                value = text[segment_start:segment_end]
+            cls._add_param(params, key, value)
+
+        return text[name_start:name_end].strip().lower(), params
+
+    @classmethod
+    def _find_infobox_boss(
+        cls, wikicode: mwparserfromhell.wikicode.Wikicode
+    ) -> Optional[Dict[str, str]]:
+        """
+        Encontra o template Infobox Boss no wikicode (caminho completo via mwparserfromhell).
+
+        Args:
+            wikicode: Objeto Wikicode parseado
 
-        for template in templates:
+        Returns:
+            Parâmetros normalizados do template ou None se não encontrado
+        """
+        for template in wikicode.filter_templates():
             # Normaliza o nome do template (remove espaços, case insensitive)
             template_name = str(template.name).strip().lower()
-
-            # Verifica se é o template Infobox Boss
-            if template_name == cls.INFOBOX_BOSS_TEMPLATE.lower():
-                return template
-
-            # Verifica se é o template Infobox Creature (usado para bosses também)
-            if template_name == cls.INFOBOX_CREATURE_TEMPLATE.lower():
-                # Verifica se é um boss (tem campo isboss = yes)
-                for param in template.params:
-                    param_name = str(param.name).strip().lower() if param.name else ""
-                    if param_name == "isboss":
-                        param_value = str(param.value).strip().lower()
-                        if param_value == "yes":
-                            return template
-                # Se não tem isboss, ainda pode ser um boss se tiver campos de boss
-                # Aceita de qualquer forma se tiver campos hp/exp
-                has_hp_or_exp = False
-                for param in template.params:
-                    param_name = str(param.name).strip().lower() if param.name else ""
-                    if param_name in ("hp", "exp", "hitpoints", "experience", "xp"):
-                        has_hp_or_exp = True
-                        break
-                if has_hp_or_exp:
-                    return template
-
-            # Também verifica variações comuns
-            if "infobox" in template_name and "boss" in template_name:
-                return template
+            params = cls._template_params(template)
+            if cls._is_boss_infobox(template_name, params):
+                return params
 
         return None
 
@@ -120,14 +416,8 @@ class WikitextParser:
         if not text:
             return None
 
-        # Remove links do tipo [[Link|Texto]] -> Texto
-        text = re.sub(r"\[\[(?:[^|\]]*\|)?([^\]]+)\]\]", r"\1", text)
-
-        # Remove tags HTML comuns como <br>, <br/>
-        text = re.sub(r"<br\s*/?>", ", ", text, flags=re.IGNORECASE)
-
-        # Remove outras tags HTML simples
-        text = re.sub(r"<[^>]+>", "", text)
+        # Em uma única passada: [[Link|Texto]] -> Texto, <br> -> ", " e remove outras tags
+        text = _CLEAN_RE.sub(_clean_sub, text)
 
         return text.strip()
 
@@ -142,29 +432,19 @@ class WikitextParser:
 
         image_value = str(image_value).strip()
 
-        # Remove links do MediaWiki ([[File:Name.gif]] ou [[:File:Name.gif]])
-        image_value = image_value.replace("[[", "").replace("]]", "")
-
-        # Remove prefixos comuns
-        for prefix in ["File:", "Image:", ":File:", ":Image:"]:
-            if image_value.startswith(prefix):
-                image_value = image_value[len(prefix) :].strip()
-
-        # Remove parâmetros de formatação (ex: |200px)
-        if "|" in image_value:
-            image_filename = image_value.split("|")[0].strip()
-        else:
-            image_filename = image_value.strip()
-
-        return image_filename
+        # Remove links ([[File:Name.gif]] ou [[:File:Name.gif]]), prefixos e parâmetros (|200px)
+        match = _IMAGE_RE.match(image_value)
+        return match.group(1).strip() if match else image_value
 
     @classmethod
-    def _extract_template_data(cls, template, boss_name: Optional[str] = None) -> BossModel:
+    def _extract_template_data(
+        cls, params: Dict[str, str], boss_name: Optional[str] = None
+    ) -> BossModel:
         """
         Extrai os dados do template Infobox Boss.
 
         Args:
-            template: Template do mwparserfromhell
+            params: Parâmetros normalizados do template (nome minúsculo -> valor)
             boss_name: Nome do boss (fallback)
 
         Returns:
@@ -189,128 +469,58 @@ class WikitextParser:
             "resistances": {},
         }
 
-        # Mapeia os campos do template para o modelo
-        field_mapping = {
-            "name": "name",
-            "hp": "hp",
-            "hitpoints": "hp",
-            "health": "hp",
-            "exp": "exp",
-            "experience": "exp",
-            "xp": "exp",
-            "speed": "speed",
-            "implemented": "version",
-            "version": "version",
-            "location": "location",
-            "loc": "location",
-            "abilities": "abilities",
-            "sounds": "sounds",
-            "loot": "loot",
-            "walks through": "walks_through",
-            "walksthrough": "walks_through",
-            "walks_through": "walks_through",
-            "weak to": "elemental_weaknesses",
-            "weakness": "elemental_weaknesses",
-            "weak": "elemental_weaknesses",
-            "strong to": "elemental_resistances",
-            "resistance": "elemental_resistances",
-            "resistant": "elemental_resistances",
-            "immunities": "immunities",
-            "immunity": "immunities",
-            "immune": "immunities",
-            "immune to": "immunities",
-            "bosstiaryclass": "bosstiary_class",
-            "image": "image",
-            "imag": "image",
-            "img": "image",
-            "picture": "image",
-        }
-
-        # Campos de resistência percentual (específicos)
-        resistance_fields = [
-            "physical",
-            "earth",
-            "fire",
-            "ice",
-            "energy",
-            "death",
-            "holy",
-            "drown",
-            "hpdrain",
-        ]
-
         # Extrai o nome do template (pode estar no primeiro parâmetro posicional ou no campo "name")
         if not data["name"]:
-            # Primeiro tenta pegar do primeiro parâmetro posicional (sem nome ou com nome numérico)
-            for param in template.params:
-                param_name_str = str(param.name).strip() if param.name else ""
-                # Parâmetros posicionais têm nome numérico ou vazio
-                if not param_name_str or param_name_str.isdigit():
-                    if param_name_str == "1" or not param_name_str:
-                        data["name"] = str(param.value).strip()
-                        break
-
-        # Itera pelos parâmetros do template
-        for param in template.params:
-            param_name = str(param.name).strip().lower() if param.name else ""
-
-            # Verifica se o parâmetro está no mapeamento
-            if param_name in field_mapping:
-                field_name = field_mapping[param_name]
-                param_value = str(param.value).strip()
-
-                if not param_value:
-                    continue
-
-                # Atribui o valor ao campo correspondente
-                if field_name == "name":
-                    data["name"] = param_value
-                elif field_name == "image":
-                    # Normaliza o nome do arquivo de imagem
-                    image_filename = cls._normalize_image_filename(param_value)
-                    data["image_filename"] = image_filename
-                elif field_name in ("hp", "exp", "speed"):
-                    data[field_name] = param_value
-                elif field_name in ("location", "version"):
-                    data[field_name] = cls._clean_wiki_text(param_value)
-                elif field_name == "bosstiary_class":
-                    data["bosstiary_class"] = param_value
-                elif field_name in (
-                    "abilities",
-                    "sounds",
-                    "loot",
-                    "walks_through",
-                    "elemental_weaknesses",
-                    "elemental_resistances",
-                    "immunities",
-                ):
-                    clean_val = cls._clean_wiki_text(param_value)
-                    if clean_val:
-                        # Se já existe valor, adiciona; senão cria lista
-                        if not data[field_name]:
-                            data[field_name] = clean_val
-                        else:
-                            # Concatena se já houver valor
-                            data[field_name] = f"{data[field_name]}, {clean_val}"
-
-            # Verifica resistências específicas
-            if param_name in resistance_fields:
-                param_value = str(param.value).strip()
-                if param_value:
-                    # Tenta converter para int (ex: "85" ou "120%")
-                    try:
-                        clean_pct = re.sub(r"[^\d]", "", param_value)
-                        if clean_pct:
-                            data["resistances"][param_name] = int(clean_pct)
-                    except ValueError:
-                        pass
+            # O primeiro parâmetro posicional é indexado como "1" (ou "" se vier como "| = Nome")
+            data["name"] = params.get("1") or params.get("", "")
+
+        # Percorre apenas os parâmetros conhecidos (parâmetros desconhecidos são ignorados)
+        for param_name, field_name in cls._FIELD_ITEMS:
+            param_value = params.get(param_name)
+            if not param_value:
+                continue
+
+            # Atribui o valor ao campo correspondente
+            if field_name == "name":
+                data["name"] = param_value
+            elif field_name == "image":
+                # Normaliza o nome do arquivo de imagem
+                image_filename = cls._normalize_image_filename(param_value)
+                data["image_filename"] = image_filename
+            elif field_name in ("hp", "exp", "speed"):
+                data[field_name] = param_value
+            elif field_name in ("location", "version"):
+                data[field_name] = cls._clean_wiki_text(param_value)
+            elif field_name == "bosstiary_class":
+                data["bosstiary_class"] = param_value
+            elif field_name in cls._LIST_FIELDS:
+                clean_val = cls._clean_wiki_text(param_value)
+                if clean_val:
+                    # Acumula os valores; a junção é feita uma única vez no final
+                    data[field_name].append(clean_val)
+
+        # Verifica resistências específicas
+        for param_name in cls._RESISTANCE_FIELDS:
+            param_value = params.get(param_name)
+            if param_value:
+                # Tenta converter para int (ex: "85" ou "120%")
+                try:
+                    clean_pct = _NON_DIGIT_RE.sub("", param_value)
+                    if clean_pct:
+                        data["resistances"][param_name] = int(clean_pct)
+                except ValueError:
+                    pass
+
+        # Junta os valores acumulados; o validator do modelo divide por vírgula
+        # e remove anotações entre parênteses
+        for field_name in cls._LIST_FIELDS:
+            data[field_name] = ", ".join(data[field_name])
 
         # Se o nome ainda não foi encontrado, tenta pegar do título da página
         if not data["name"] and boss_name:
             data["name"] = boss_name
 
         # Processa dados do Bosstiary
-        bosstiary_data = None
         boss_class = data.pop("bosstiary_class", None)
         if boss_class:
             kills = None
@@ -322,23 +532,15 @@ class WikitextParser:
             elif "bane" in bc_lower:
                 kills = 2500
 
-            from app.models.boss import BosstiaryStats
-
-            bosstiary_data = BosstiaryStats(class_name=boss_class, kills_required=kills)
-
-        # Remove image_filename do dict antes de criar o modelo
-        image_filename = data.pop("image_filename", None)
-
-        # Cria o modelo
-        boss_model = BossModel(**data, bosstiary=bosstiary_data)
+            data["bosstiary"] = {"class_name": boss_class, "kills_required": kills}
 
         # Adiciona o filename ao modelo se encontrado ou usa fallback baseado no nome
+        image_filename = data.pop("image_filename", None)
         if not image_filename and data["name"]:
             image_filename = f"{data['name']}.gif"
 
         if image_filename:
-            from app.models.boss import BossVisuals
-
-            boss_model.visuals = BossVisuals(filename=image_filename)
+            data["visuals"] = {"filename": image_filename}
 
-        return boss_model
+        # Cria o modelo com uma única validação (submodelos validados a partir dos dicts)
+        return BossModel.model_validate(data)
@@ -0,0 +1,113 @@
+"""Limitador de concorrência adaptativo (AIMD) guiado pelas respostas HTTP."""
+
+import asyncio
+import logging
+from collections import deque
+from typing import Deque
+
+logger = logging.getLogger(__name__)
+
+
+class AdaptiveLimiter:
+    """
+    Substituto de asyncio.Semaphore cujo limite se ajusta às respostas do servidor.
+
+    Segue o esquema AIMD: o limite cai pela metade a cada 429/5xx reportado e
+    sobe uma unidade após uma sequência de respostas bem-sucedidas.
+    """
+
+    DEFAULT_MIN_LIMIT = 1
+    DEFAULT_MAX_LIMIT = 50
+    # Respostas bem-sucedidas consecutivas necessárias para aumentar o limite
+    DEFAULT_INCREASE_AFTER = 20
+
+    def __init__(
+        self,
+        initial_limit: int,
+        min_limit: int = DEFAULT_MIN_LIMIT,
+        max_limit: int = DEFAULT_MAX_LIMIT,
+        increase_after: int = DEFAULT_INCREASE_AFTER,
+    ):
+        """
+        Inicializa o limitador.
+
+        Args:
+            initial_limit: Número inicial de operações simultâneas
+            min_limit: Limite mínimo (nunca reduz abaixo disso)
+            max_limit: Limite máximo (nunca aumenta acima disso)
+            increase_after: Sucessos consecutivos necessários para aumentar o limite
+        """
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.increase_after = increase_after
+        self._limit = max(min_limit, min(initial_limit, max_limit))
+        self._in_flight = 0
+        self._successes = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+
+    @property
+    def limit(self) -> int:
+        """Limite atual de operações simultâneas."""
+        return self._limit
+
+    async def __aenter__(self):
+        """Context manager entry (equivalente a acquire)."""
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """Context manager exit (equivalente a release)."""
+        self.release()
+
+    async def acquire(self):
+        """Aguarda até haver uma vaga dentro do limite atual."""
+        if self._in_flight < self._limit and not self._waiters:
+            self._in_flight += 1
+            return
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            # A vaga pode ter sido concedida no mesmo ciclo do cancelamento
+            if waiter.done() and not waiter.cancelled():
+                self.release()
+            raise
+
+    def release(self):
+        """Libera uma vaga e acorda quem estiver aguardando."""
+        self._in_flight -= 1
+        self._wake_waiters()
+
+    def report(self, status_code: int):
+        """
+        Ajusta o limite a partir do status de uma resposta HTTP.
+
+        Args:
+            status_code: Status HTTP recebido
+        """
+        if status_code == 429 or status_code >= 500:
+            self._successes = 0
+            new_limit = max(self.min_limit, self._limit // 2)
+            if new_limit != self._limit:
+                logger.warning(
+                    f"Resposta {status_code}: reduzindo concorrência de {self._limit} para {new_limit}"
+                )
+                self._limit = new_limit
+        elif status_code < 400:
+            self._successes += 1
+            if self._successes >= self.increase_after:
+                self._successes = 0
+                if self._limit < self.max_limit:
+                    self._limit += 1
+                    logger.debug(f"Aumentando concorrência para {self._limit}")
+                    self._wake_waiters()
+
+    def _wake_waiters(self):
+        """Concede vagas livres aos primeiros da fila de espera."""
+        while self._waiters and self._in_flight < self._limit:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self._in_flight += 1
+                waiter.set_result(None)
@@ -1,11 +1,16 @@
 """Sistema de Dead Letter Logging para erros de parsing e processamento."""
 
-import json
+import atexit
 import logging
+import queue
+import threading
+import time
 import traceback
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Optional
+from typing import Any, BinaryIO, Dict, List, Optional
+
+import orjson
 
 logger = logging.getLogger(__name__)
 
@@ -13,6 +18,13 @@ logger = logging.getLogger(__name__)
 LOG_DIR = Path("logs")
 LOG_FILE = LOG_DIR / "parsing_errors.jsonl"
 MAX_SNIPPET_LENGTH = 500
+FLUSH_BATCH_SIZE = 64  # Máximo de entradas gravadas por escrita
+FLUSH_INTERVAL = 0.5  # Tempo máximo (s) aguardando mais entradas antes de gravar
+COUNT_CHUNK_SIZE = 1024 * 1024  # Bytes lidos por vez em get_log_count
+FLUSH_TIMEOUT = 5.0  # Tempo máximo (s) que flush()/close() aguardam a thread de escrita
+
+# Marcador enfileirado por close() para encerrar a thread de escrita
+_STOP = object()
 
 
 class DeadLetterLogger:
@@ -28,10 +40,147 @@ class DeadLetterLogger:
         self.log_file = log_file
         self._ensure_log_directory()
 
+        # Arquivo mantido aberto entre os lotes (aberto na primeira gravação)
+        self._file: Optional[BinaryIO] = None
+        self._file_lock = threading.Lock()
+
+        # Entradas no arquivo, contadas uma vez (sob demanda) e depois mantidas em memória
+        self._count: Optional[int] = None
+
+        # As entradas são gravadas em lote por uma thread em segundo plano,
+        # iniciada na primeira entrada registrada e encerrada por close()
+        self._queue: "queue.Queue[Any]" = queue.Queue()
+        self._writer: Optional[threading.Thread] = None
+        self._writer_lock = threading.Lock()
+
     def _ensure_log_directory(self):
         """Garante que o diretório de logs existe."""
         self.log_file.parent.mkdir(parents=True, exist_ok=True)
 
+    def _ensure_writer(self):
+        """Inicia a thread de escrita, se ainda não estiver rodando."""
+        with self._writer_lock:
+            if self._writer is not None and self._writer.is_alive():
+                return
+            self._writer = threading.Thread(
+                target=self._drain, name="dead-letter-writer", daemon=True
+            )
+            self._writer.start()
+            # Grava o que estiver pendente na saída do processo (desfeito por close())
+            atexit.register(self.close)
+
+    def _enqueue(self, entry: Any):
+        """
+        Enfileira uma entrada (ou marcador) para a thread de escrita.
+
+        Args:
+            entry: Registro estruturado, evento de flush ou _STOP
+        """
+        self._ensure_writer()
+        self._queue.put(entry)
+
+    def _drain(self):
+        """Consome a fila e grava as entradas em lotes (executa na thread de escrita)."""
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + FLUSH_INTERVAL
+
+            # Agrupa até FLUSH_BATCH_SIZE entradas, até FLUSH_INTERVAL expirar ou até um marcador
+            while isinstance(batch[-1], dict) and len(batch) < FLUSH_BATCH_SIZE:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=timeout))
+                except queue.Empty:
+                    break
+
+            try:
+                self._write_batch([entry for entry in batch if isinstance(entry, dict)])
+            finally:
+                # Libera quem aguarda em flush() (eventos enfileirados junto com o lote)
+                for entry in batch:
+                    if isinstance(entry, threading.Event):
+                        entry.set()
+
+            if batch[-1] is _STOP:
+                return
+
+    def _write_batch(self, entries: List[Dict[str, Any]]):
+        """
+        Grava um lote de entradas no arquivo JSONL com uma única escrita.
+
+        Args:
+            entries: Registros estruturados a gravar
+        """
+        if not entries:
+            return
+
+        try:
+            # orjson gera JSON compacto já em bytes UTF-8 (sem etapa de encode)
+            data = b"".join(orjson.dumps(entry) + b"\n" for entry in entries)
+            with self._file_lock:
+                if self._file is None:
+                    self._file = open(self.log_file, "ab")
+                self._file.write(data)
+                # Deixa o lote visível para leitores assim que flush() retornar
+                self._file.flush()
+                if self._count is not None:
+                    self._count += len(entries)
+        except Exception as e:
+            # Se falhar ao escrever o log, registra no logger padrão
+            logger.error(f"Erro ao escrever dead letter log: {e}")
+
+    def flush(self, timeout: float = FLUSH_TIMEOUT) -> bool:
+        """
+        Aguarda até que as entradas enfileiradas tenham sido gravadas.
+
+        Args:
+            timeout: Tempo máximo de espera em segundos
+
+        Returns:
+            True se as entradas foram gravadas (ou não havia thread de escrita), False no timeout
+        """
+        writer = self._writer
+        # Sem thread viva (nunca iniciada, encerrada ou perdida em um fork) não há o que aguardar
+        if writer is None or not writer.is_alive():
+            return True
+
+        done = threading.Event()
+        self._queue.put(done)
+        if not done.wait(timeout):
+            logger.warning(f"Dead letter log: flush não concluído em {timeout:.1f}s")
+            return False
+        return True
+
+    def close(self, timeout: float = FLUSH_TIMEOUT):
+        """
+        Grava as entradas pendentes, encerra a thread de escrita e fecha o arquivo.
+
+        Uma nova entrada registrada depois do close() reinicia a thread e reabre o arquivo.
+
+        Args:
+            timeout: Tempo máximo de espera pela thread de escrita em segundos
+        """
+        with self._writer_lock:
+            writer, self._writer = self._writer, None
+            atexit.unregister(self.close)
+
+        if writer is not None and writer.is_alive():
+            self._queue.put(_STOP)
+            writer.join(timeout)
+            if writer.is_alive():
+                logger.warning(f"Dead letter log: escrita ainda ativa após {timeout:.1f}s")
+
+        self._close_file()
+
+    def _close_file(self):
+        """Fecha o arquivo de log, se estiver aberto."""
+        with self._file_lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
     def _get_traceback_summary(self, exception: Exception) -> str:
         """
         Extrai um resumo do traceback.
@@ -42,16 +191,41 @@ class DeadLetterLogger:
         Returns:
             String com resumo do traceback (últimas 3 linhas)
         """
+        # Exceções vindas do pool de processos trazem o traceback do worker em texto
+        # (__cause__.tb); o traceback local só teria os frames do executor
+        remote_tb = getattr(exception.__cause__, "tb", None)
+        if isinstance(remote_tb, str):
+            return self._summarize_remote_traceback(remote_tb)
+
         try:
-            tb_lines = traceback.format_exception(
-                type(exception), exception, exception.__traceback__
+            # Formata apenas os 2 últimos frames, sem exceções encadeadas
+            tb_exception = traceback.TracebackException(
+                type(exception), exception, exception.__traceback__, limit=-2, compact=True
             )
+            tb_lines = list(tb_exception.format(chain=False))
             # Pega as últimas 3 linhas do traceback
             summary = "".join(tb_lines[-3:]).strip()
             return summary
         except Exception:
             return str(exception)
 
+    @staticmethod
+    def _summarize_remote_traceback(text: str) -> str:
+        """
+        Resume um traceback em texto no mesmo formato de _get_traceback_summary.
+
+        Args:
+            text: Traceback formatado no processo worker
+
+        Returns:
+            Os 2 últimos frames e a linha da exceção
+        """
+        # O executor envolve o texto em aspas triplas
+        lines = text.strip().strip('"').strip().splitlines()
+        frames = [index for index, line in enumerate(lines) if line.startswith("  File ")]
+        start = frames[-2] if len(frames) > 1 else (frames[0] if frames else 0)
+        return "\n".join(lines[start:]).strip()
+
     def _truncate_snippet(self, text: str, max_length: int = MAX_SNIPPET_LENGTH) -> str:
         """
         Trunca o texto para o tamanho máximo especificado.
@@ -80,6 +254,8 @@ class DeadLetterLogger:
         """
         Registra um erro de parsing no arquivo de log.
 
+        A gravação é assíncrona; use flush() para garantir que a entrada já está no arquivo.
+
         Args:
             boss_name: Nome do boss que causou o erro
             error: Exceção capturada
@@ -94,15 +270,13 @@ class DeadLetterLogger:
                 "raw_data_snippet": self._truncate_snippet(raw_data or ""),
             }
 
-            # Escreve no arquivo JSONL (uma linha JSON por entrada)
-            with open(self.log_file, "a", encoding="utf-8") as f:
-                json.dump(log_entry, f, ensure_ascii=False)
-                f.write("\n")
+            # Enfileira para gravação em lote no arquivo JSONL (uma linha JSON por entrada)
+            self._enqueue(log_entry)
 
             logger.debug(f"Erro de parsing logado para {boss_name}")
 
         except Exception as e:
-            # Se falhar ao escrever o log, registra no logger padrão
+            # Se falhar ao montar o registro, registra no logger padrão
             logger.error(f"Erro ao escrever dead letter log: {e}")
 
     def log_image_error(
@@ -127,9 +301,7 @@ class DeadLetterLogger:
                 "raw_data_snippet": f"Image filename: {image_filename or 'unknown'}",
             }
 
-            with open(self.log_file, "a", encoding="utf-8") as f:
-                json.dump(log_entry, f, ensure_ascii=False)
-                f.write("\n")
+            self._enqueue(log_entry)
 
             logger.debug(f"Erro de imagem logado para {boss_name}")
 
@@ -140,15 +312,35 @@ class DeadLetterLogger:
         """
         Retorna o número de entradas no arquivo de log.
 
+        O arquivo só é lido na primeira chamada; depois o total é mantido em memória
+        a cada lote gravado.
+
         Returns:
             Número de linhas no arquivo de log
         """
+        self.flush()
+
+        with self._file_lock:
+            if self._count is None:
+                self._count = self._count_file_lines()
+            return self._count
+
+    def _count_file_lines(self) -> int:
+        """
+        Conta as entradas existentes no arquivo de log.
+
+        Returns:
+            Número de linhas no arquivo de log (0 se não existir ou não puder ser lido)
+        """
         try:
             if not self.log_file.exists():
                 return 0
 
-            with open(self.log_file, "r", encoding="utf-8") as f:
-                return sum(1 for line in f if line.strip())
+            # Cada entrada JSONL termina em "\n": conta os bytes em blocos, sem decodificar
+            with open(self.log_file, "rb") as f:
+                return sum(
+                    chunk.count(b"\n") for chunk in iter(lambda: f.read(COUNT_CHUNK_SIZE), b"")
+                )
 
         except Exception as e:
             logger.error(f"Erro ao contar entradas no log: {e}")
@@ -156,10 +348,16 @@ class DeadLetterLogger:
 
     def clear_logs(self):
         """Limpa o arquivo de log (útil para testes)."""
+        # Fecha o arquivo para que as próximas gravações criem um novo
+        self.close()
+
         try:
             if self.log_file.exists():
                 self.log_file.unlink()
+            self._count = 0
         except Exception as e:
+            # Estado do arquivo incerto: recontar na próxima consulta
+            self._count = None
             logger.error(f"Erro ao limpar log: {e}")
 
 
@@ -1,11 +1,14 @@
+from concurrent.futures import ThreadPoolExecutor
+
 import requests
 
 # Configurações
 WIKI_API = "https://tibia.fandom.com/api.php"
 MY_API = "https://tibia-boss-api.onrender.com/api/v1/bosses"
+MAX_WORKERS = 8  # Páginas da nossa API buscadas em paralelo
 
 
-def get_wiki_bosses():
+def get_wiki_bosses(session: requests.Session):
     """Busca todos os títulos da categoria Bosses na Wiki"""
     print("📡 Consultando TibiaWiki...")
     bosses = set()
@@ -20,10 +23,10 @@ def get_wiki_bosses():
     }
 
     while True:
-        response = requests.get(WIKI_API, params=params).json()
-        for member in response["query"]["categorymembers"]:
-            if member["ns"] == 0:
-                bosses.add(member["title"])
+        response = session.get(WIKI_API, params=params).json()
+        bosses.update(
+            member["title"] for member in response["query"]["categorymembers"] if member["ns"] == 0
+        )
 
         if "continue" in response:
             params["cmcontinue"] = response["continue"]["cmcontinue"]
@@ -33,32 +36,40 @@ def get_wiki_bosses():
     return bosses
 
 
-def get_my_api_bosses():
+def get_my_api_bosses(session: requests.Session):
     """Busca todos os nomes cadastrados na nossa API usando paginação"""
     print("📡 Consultando Nossa API...")
     bosses = set()
-    page = 1
     limit = 100
 
-    while True:
-        response = requests.get(f"{MY_API}?page={page}&limit={limit}").json()
-        if "items" not in response:
-            print(f"❌ Erro ao buscar página {page}: {response}")
-            break
+    def fetch_page(page):
+        return page, session.get(f"{MY_API}?page={page}&limit={limit}").json()
 
-        for item in response["items"]:
-            bosses.add(item["name"])
+    # A primeira página informa o total de páginas; as demais são buscadas em paralelo
+    _, first = fetch_page(1)
+    if "items" not in first:
+        print(f"❌ Erro ao buscar página 1: {first}")
+        return bosses
 
-        if page >= response["pages"]:
-            break
-        page += 1
+    responses = [first]
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        for page, response in executor.map(fetch_page, range(2, first["pages"] + 1)):
+            if "items" not in response:
+                print(f"❌ Erro ao buscar página {page}: {response}")
+                continue
+            responses.append(response)
+
+    for response in responses:
+        bosses.update(item["name"] for item in response["items"])
 
     return bosses
 
 
 def audit():
-    wiki_set = get_wiki_bosses()
-    db_set = get_my_api_bosses()
+    # Uma única sessão reaproveita as conexões (TCP + TLS) entre as páginas
+    with requests.Session() as session:
+        wiki_set = get_wiki_bosses(session)
+        db_set = get_my_api_bosses(session)
 
     print(f"\n📊 RESUMO:")
     print(f"Wiki Encontrou: {len(wiki_set)}")
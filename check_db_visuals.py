@@ -23,36 +23,50 @@ def check_visuals():
         db = client[database_name]
         collection = db["bosses"]
 
-        # Conta total de bosses
-        total = collection.count_documents({})
-        print(f"📊 Total de bosses no banco: {total}")
+        # Uma única agregação calcula todas as estatísticas e a amostra (1 round-trip)
+        pipeline = [
+            {
+                "$facet": {
+                    "total": [{"$count": "n"}],
+                    "null_visuals": [{"$match": {"visuals": None}}, {"$count": "n"}],
+                    "null_gif_url": [{"$match": {"visuals.gif_url": None}}, {"$count": "n"}],
+                    # Qualquer variante de URL de placeholder (não só o PLACEHOLDER_URL atual)
+                    "placeholder": [
+                        {"$match": {"visuals.gif_url": {"$regex": "placeholder"}}},
+                        {"$count": "n"},
+                    ],
+                    # Amostra de 10 bosses que tenham o campo visuals
+                    "sample": [
+                        {"$match": {"visuals": {"$exists": True}}},
+                        {"$limit": 10},
+                        {"$project": {"_id": 0, "name": 1, "visuals": 1}},
+                    ],
+                }
+            }
+        ]
+        stats = next(collection.aggregate(pipeline))
 
-        # Busca 5 bosses aleatórios que tenham o campo visuals
-        sample = collection.find({"visuals": {"$exists": True}}).limit(10)
+        def facet_count(key):
+            return stats[key][0]["n"] if stats[key] else 0
+
+        print(f"📊 Total de bosses no banco: {facet_count('total')}")
 
         print("\n📝 Amostra de Bosses e seus Visuals:")
         print("-" * 60)
-        found = False
-        for boss in sample:
-            found = True
+        for boss in stats["sample"]:
             name = boss.get("name", "N/A")
             visuals = boss.get("visuals")
             print(f"Boss: {name}")
             print(f"Visuals: {visuals}")
             print("-" * 30)
 
-        if not found:
+        if not stats["sample"]:
             print("❌ Nenhum boss com o campo 'visuals' encontrado!")
 
-        # Verifica se existem bosses com visuals null ou campos internos null
-        null_visuals = collection.count_documents({"visuals": None})
-        null_gif_url = collection.count_documents({"visuals.gif_url": None})
-        placeholder_count = collection.count_documents({"visuals.gif_url": {"$regex": "placeholder"}})
-
         print(f"\n📈 Estatísticas:")
-        print(f"- Bosses com visuals nulo: {null_visuals}")
-        print(f"- Bosses com gif_url nulo: {null_gif_url}")
-        print(f"- Bosses usando placeholder: {placeholder_count}")
+        print(f"- Bosses com visuals nulo: {facet_count('null_visuals')}")
+        print(f"- Bosses com gif_url nulo: {facet_count('null_gif_url')}")
+        print(f"- Bosses usando placeholder: {facet_count('placeholder')}")
 
     except Exception as e:
         print(f"❌ Erro ao conectar: {e}")
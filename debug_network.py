@@ -11,6 +11,7 @@ MONGODB_URL/MONGO_URL (connection string do Atlas ou local).
 from __future__ import annotations
 
 import argparse
+import functools
 import socket
 import ssl
 import sys
@@ -22,6 +23,9 @@ import certifi
 
 from app.core.config import settings
 
+# Contexto TLS criado uma única vez (carregar o bundle de CAs do certifi é o passo caro)
+_TLS_CTX = ssl.create_default_context(cafile=certifi.where())
+
 
 @dataclass
 class DnsResult:
@@ -29,6 +33,7 @@ class DnsResult:
     host: str
     ip: Optional[str]
     error: Optional[str] = None
+    addresses: tuple[str, ...] = ()
 
 
 @dataclass
@@ -57,11 +62,19 @@ def parse_mongo_url(url: str) -> tuple[str, int]:
     return host, port
 
 
+@functools.lru_cache(maxsize=256)
+def _resolve_addresses(host: str) -> tuple[str, ...]:
+    """Resolve todos os endereços IPv4/IPv6 do host (memoizado durante o processo)."""
+    infos = socket.getaddrinfo(host, None, type=socket.SOCK_STREAM)
+    # Remove duplicatas mantendo a ordem de preferência do resolver
+    return tuple(dict.fromkeys(info[4][0] for info in infos))
+
+
 def diagnose_dns(host: str) -> DnsResult:
-    """Testa resolução DNS usando socket.gethostbyname."""
+    """Testa resolução DNS (A e AAAA) usando socket.getaddrinfo."""
     try:
-        ip = socket.gethostbyname(host)
-        return DnsResult(ok=True, host=host, ip=ip)
+        addresses = _resolve_addresses(host)
+        return DnsResult(ok=True, host=host, ip=addresses[0], addresses=addresses)
     except socket.gaierror as exc:
         return DnsResult(ok=False, host=host, ip=None, error=str(exc))
     except Exception as exc:  # noqa: BLE001
@@ -70,11 +83,9 @@ def diagnose_dns(host: str) -> DnsResult:
 
 def diagnose_tls(host: str, port: int) -> TlsResult:
     """Testa handshake TLS usando ssl + certifi."""
-    context = ssl.create_default_context(cafile=certifi.where())
-
     try:
         with socket.create_connection((host, port), timeout=10) as sock:
-            with context.wrap_socket(sock, server_hostname=host):
+            with _TLS_CTX.wrap_socket(sock, server_hostname=host):
                 # Se chegar aqui, handshake TLS foi bem-sucedido
                 return TlsResult(ok=True, host=host, port=port)
     except Exception as exc:  # noqa: BLE001
@@ -123,7 +134,7 @@ def main(argv: Optional[list[str]] = None) -> int:
     dns_result = diagnose_dns(host)
     if dns_result.ok:
         print("✅ DNS OK")
-        print(f"   {host} -> {dns_result.ip}")
+        print(f"   {host} -> {', '.join(dns_result.addresses)}")
     else:
         print("❌ DNS FALHOU")
         print(f"   Host: {dns_result.host}")
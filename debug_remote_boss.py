@@ -1,36 +1,53 @@
 import asyncio
 import logging
+import sys
 
 from app.services.tibiawiki_client import TibiaWikiClient
 from app.services.wikitext_parser import WikitextParser
 
 logging.basicConfig(level=logging.INFO)
 
-async def debug_boss(name):
+
+def report_boss(name, wikitext):
+    if isinstance(wikitext, Exception):
+        print(f"❌ Error fetching {name}: {wikitext}")
+        return
+    if not wikitext:
+        print(f"❌ Wikitext not found for {name}")
+        return
+
+    print(f"📄 {name} - Wikitext length: {len(wikitext)}")
+    print("-" * 40)
+    # Print first 500 chars
+    print(wikitext[:500])
+    print("-" * 40)
+
+    try:
+        boss = WikitextParser.parse(wikitext, boss_name=name)
+        print(f"✅ Parsed boss: {boss.name}")
+        print(f"   HP: {boss.hp}")
+        print(f"   Visuals: {boss.visuals}")
+    except Exception as e:
+        print(f"❌ Error: {e}")
+
+
+async def debug_bosses(names):
     async with TibiaWikiClient() as client:
-        print(f"🔍 Fetching wikitext for {name}...")
-        try:
-            # Try to get by title
-            wikitext = await client.get_boss_wikitext(title=name)
-            if not wikitext:
-                print(f"❌ Wikitext not found for {name}")
-                return
-
-            print(f"📄 Wikitext length: {len(wikitext)}")
-            print("-" * 40)
-            # Print first 500 chars
-            print(wikitext[:500])
-            print("-" * 40)
-
-            boss = WikitextParser.parse(wikitext, boss_name=name)
-            print(f"✅ Parsed boss: {boss.name}")
-            print(f"   HP: {boss.hp}")
-            print(f"   Visuals: {boss.visuals}")
-            
-        except Exception as e:
-            print(f"❌ Error: {e}")
+        print(f"🔍 Fetching wikitext for {', '.join(names)}...")
+        # Busca todos os bosses em paralelo com o mesmo cliente
+        results = await asyncio.gather(
+            *(client.get_boss_wikitext(title=name) for name in names),
+            return_exceptions=True,
+        )
 
+    for name, wikitext in zip(names, results):
+        report_boss(name, wikitext)
 
-if __name__ == "__main__":
-    asyncio.run(debug_boss("Abyssador"))
 
+async def debug_boss(name):
+    await debug_bosses([name])
+
+
+if __name__ == "__main__":
+    # Uso: python debug_remote_boss.py "Abyssador" "Morgaroth" ...
+    asyncio.run(debug_bosses(sys.argv[1:] or ["Abyssador"]))
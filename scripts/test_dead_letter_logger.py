@@ -1,12 +1,19 @@
 """Script de teste manual para o Dead Letter Logger."""
 
 import asyncio
+import mmap
+from collections import deque
 from pathlib import Path
 
+import orjson
+
 from app.services.tibiawiki_client import TibiaWikiClient
 from app.services.wikitext_parser import ParserError, WikitextParser
 from app.utils.dead_letter_logger import dead_letter_logger
 
+# Quantidade de entradas (as mais recentes) exibidas ao final do teste
+MAX_DISPLAYED_ENTRIES = 5
+
 # Limpa logs anteriores
 dead_letter_logger.clear_logs()
 
@@ -39,24 +46,28 @@ async def test_with_intentional_error():
 
         print("✅ Erro logado no dead letter logger\n")
 
+    # A gravação é feita em segundo plano; garante que a entrada já está no arquivo
+    dead_letter_logger.flush()
+
     # Verifica se o arquivo foi criado
     log_file = Path("logs/parsing_errors.jsonl")
-    if log_file.exists():
+    if log_file.exists() and log_file.stat().st_size:
         print(f"✅ Arquivo de log criado: {log_file}\n")
 
-        # Lê e exibe o conteúdo
-        with open(log_file, "r", encoding="utf-8") as f:
-            for line in f:
-                import json
-
-                entry = json.loads(line)
-                print("📋 Conteúdo do log:")
-                print(f"  Timestamp: {entry['timestamp']}")
-                print(f"  Boss Name: {entry['boss_name']}")
-                print(f"  Error Message: {entry['error_message'][:100]}...")
-                print(f"  Raw Data Snippet (primeiros 200 chars):")
-                print(f"    {entry['raw_data_snippet'][:200]}...")
-                print()
+        # Lê as linhas direto do arquivo mapeado em memória, guardando só as últimas
+        with open(log_file, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            last_lines = deque(iter(mm.readline, b""), maxlen=MAX_DISPLAYED_ENTRIES)
+
+        # Exibe o conteúdo
+        for line in last_lines:
+            entry = orjson.loads(line)
+            print("📋 Conteúdo do log:")
+            print(f"  Timestamp: {entry['timestamp']}")
+            print(f"  Boss Name: {entry['boss_name']}")
+            print(f"  Error Message: {entry['error_message'][:100]}...")
+            print(f"  Raw Data Snippet (primeiros 200 chars):")
+            print(f"    {entry['raw_data_snippet'][:200]}...")
+            print()
 
         print(f"✅ Total de entradas no log: {dead_letter_logger.get_log_count()}")
     else:
@@ -9,8 +9,9 @@ from pathlib import Path
 # Adiciona o diretório raiz ao path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from app.main_scraper import process_boss
+from app.main_scraper import enable_eager_tasks, process_boss, shutdown_parse_pool
 from app.services.tibiawiki_client import TibiaWikiClient
+from app.utils.adaptive_limiter import AdaptiveLimiter
 
 logging.basicConfig(
     level=logging.INFO,
@@ -22,11 +23,13 @@ logger = logging.getLogger(__name__)
 
 async def test_with_few_bosses():
     """Testa o scraper com apenas os primeiros 5 bosses."""
+    enable_eager_tasks()
+
     logger.info("Testando scraper com primeiros 5 bosses...")
 
-    semaphore = asyncio.Semaphore(10)
+    semaphore = AdaptiveLimiter(10)
 
-    async with TibiaWikiClient() as client:
+    async with TibiaWikiClient(limiter=semaphore) as client:
         # Busca lista de bosses
         bosses_list = await client.get_all_bosses()
         test_bosses = bosses_list[:5]  # Apenas os primeiros 5
@@ -35,16 +38,23 @@ async def test_with_few_bosses():
 
         # Processa
         tasks = [process_boss(client, boss_info, semaphore) for boss_info in test_bosses]
-        results = await asyncio.gather(*tasks, return_exceptions=True)
 
-        # Mostra resultados
-        success = sum(1 for r in results if r is not None and not isinstance(r, Exception))
+        # Mostra cada resultado assim que fica pronto
+        success = 0
+        for next_result in asyncio.as_completed(tasks):
+            try:
+                result = await next_result
+            except Exception as e:
+                logger.error(f"  ❌ Exceção: {e}")
+                continue
+
+            if result is not None:
+                success += 1
+                logger.info(f"  ✅ {result.name}: HP={result.hp}, EXP={result.exp}")
+
         logger.info(f"Sucesso: {success}/{len(test_bosses)}")
 
-        # Mostra alguns resultados
-        for result in results:
-            if result and not isinstance(result, Exception):
-                logger.info(f"  ✅ {result.name}: HP={result.hp}, EXP={result.exp}")
+    await shutdown_parse_pool()
 
 
 if __name__ == "__main__":
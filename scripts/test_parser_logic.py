@@ -34,19 +34,21 @@ def test_parsing_logic():
     try:
         boss = WikitextParser.parse(wikitext, boss_name="Abyssador")
         
-        print("\n=== EXTRACTED DATA ===")
-        print(f"Name:    {boss.name}")
-        print(f"HP:      {boss.hp}")
-        print(f"EXP:     {boss.exp}")
-        print(f"Speed:   {boss.speed}")
-        print(f"Version: {boss.version}")
-        print(f"Loot:       {boss.loot}")
-        print(f"Abilities:  {boss.abilities}")
-        print(f"Sounds:     {boss.sounds}")
-        print(f"Resistances (Detailed):")
-        for k, v in boss.resistances.items():
-            print(f"  - {k}: {v}%")
-            
+        # Monta o relatório inteiro e escreve de uma vez
+        lines = [
+            "\n=== EXTRACTED DATA ===",
+            f"Name:    {boss.name}",
+            f"HP:      {boss.hp}",
+            f"EXP:     {boss.exp}",
+            f"Speed:   {boss.speed}",
+            f"Version: {boss.version}",
+            f"Loot:       {boss.loot}",
+            f"Abilities:  {boss.abilities}",
+            f"Sounds:     {boss.sounds}",
+            "Resistances (Detailed):",
+            *(f"  - {k}: {v}%" for k, v in boss.resistances.items()),
+        ]
+
         errors = []
         if boss.hp != 340000: errors.append(f"HP {boss.hp} != 340000")
         if boss.exp != 400000: errors.append(f"EXP {boss.exp} != 400000")
@@ -57,12 +59,13 @@ def test_parsing_logic():
         if boss.resistances.get("fire") != 85: errors.append("Fire resistance != 85")
         
         if not errors:
-            print("\n✅ ALL TESTS PASSED!")
+            lines.append("\n✅ ALL TESTS PASSED!")
         else:
-            print("\n❌ TESTS FAILED:")
-            for e in errors:
-                print(f"  - {e}")
-                
+            lines.append("\n❌ TESTS FAILED:")
+            lines.extend(f"  - {e}" for e in errors)
+
+        print("\n".join(lines))
+
     except Exception as e:
         print(f"An error occurred: {e}")
         import traceback
@@ -22,40 +22,44 @@ async def test_abyssador_extraction():
         print("Parsing wikitext...")
         boss = WikitextParser.parse(wikitext, boss_name="Abyssador")
         
-        print("\n=== EXTRACTED DATA (ABYSSADOR) ===")
-        print(f"Name:    {boss.name}")
-        print(f"HP:      {boss.hp}")
-        print(f"EXP:     {boss.exp}")
-        print(f"Speed:   {boss.speed}")
-        print(f"Version: {boss.version}")
-        print(f"Loot:       {boss.loot}")
-        print(f"Abilities:  {boss.abilities}")
-        print(f"Sounds:     {boss.sounds}")
-        print(f"Resistances (Detailed):")
-        for k, v in boss.resistances.items():
-            print(f"  - {k}: {v}%")
-        
+        # Monta o relatório inteiro e escreve de uma vez
+        lines = [
+            "\n=== EXTRACTED DATA (ABYSSADOR) ===",
+            f"Name:    {boss.name}",
+            f"HP:      {boss.hp}",
+            f"EXP:     {boss.exp}",
+            f"Speed:   {boss.speed}",
+            f"Version: {boss.version}",
+            f"Loot:       {boss.loot}",
+            f"Abilities:  {boss.abilities}",
+            f"Sounds:     {boss.sounds}",
+            "Resistances (Detailed):",
+            *(f"  - {k}: {v}%" for k, v in boss.resistances.items()),
+        ]
+
         # Verify specific values from the user report
-        print("\n=== VERIFICATION ===")
+        lines.append("\n=== VERIFICATION ===")
         if boss.hp == 340000:
-            print("✅ HP matches (340,000)")
+            lines.append("✅ HP matches (340,000)")
         else:
-            print(f"❌ HP mismatch: {boss.hp}")
-            
+            lines.append(f"❌ HP mismatch: {boss.hp}")
+
         if boss.exp == 400000:
-            print("✅ EXP matches (400,000)")
+            lines.append("✅ EXP matches (400,000)")
         else:
-            print(f"❌ EXP mismatch: {boss.exp}")
+            lines.append(f"❌ EXP mismatch: {boss.exp}")
 
         if boss.resistances.get("earth") == 0:
-            print("✅ Earth Resistance matches (0%)")
+            lines.append("✅ Earth Resistance matches (0%)")
         else:
-            print(f"❌ Earth Resistance mismatch: {boss.resistances.get('earth')}")
+            lines.append(f"❌ Earth Resistance mismatch: {boss.resistances.get('earth')}")
 
         if boss.resistances.get("fire") == 85:
-            print("✅ Fire Resistance matches (85%)")
+            lines.append("✅ Fire Resistance matches (85%)")
         else:
-            print(f"❌ Fire Resistance mismatch: {boss.resistances.get('fire')}")
+            lines.append(f"❌ Fire Resistance mismatch: {boss.resistances.get('fire')}")
+
+        print("\n".join(lines))
 
 if __name__ == "__main__":
     asyncio.run(test_abyssador_extraction())
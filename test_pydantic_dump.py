@@ -30,3 +30,7 @@ boss_no_visuals = BossModel(name="Test Boss", hp=50)
 print("\nBoss no visuals dict:")
 print(json.dumps(boss_no_visuals.model_dump(), indent=2))
 
+# Formato persistido no MongoDB: campos None não são gravados
+print("\nBoss no visuals dict (exclude_none):")
+print(json.dumps(boss_no_visuals.model_dump(exclude_none=True), indent=2))
+
@@ -0,0 +1,41 @@
+"""Fixtures compartilhadas pelos testes de integração com MongoDB."""
+
+import os
+
+import pytest_asyncio
+from motor.motor_asyncio import AsyncIOMotorClient
+
+MONGODB_TEST_URL = "mongodb://localhost:27017"
+
+# Id do worker do pytest-xdist ("gw0", "gw1", ...); "main" quando roda sem -n
+XDIST_WORKER = os.environ.get("PYTEST_XDIST_WORKER", "main")
+
+
+def worker_database_name(base_name: str) -> str:
+    """
+    Nome do banco de teste exclusivo do worker atual.
+
+    Com `pytest -n auto` cada worker roda em um processo próprio; o sufixo evita
+    que dois workers criem/derrubem o mesmo banco ao mesmo tempo.
+
+    Args:
+        base_name: Nome base do banco (um por módulo de teste)
+
+    Returns:
+        Nome do banco com o id do worker (ex: "tibia_bosses_lock_test_gw0")
+    """
+    return f"{base_name}_{XDIST_WORKER}"
+
+
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def motor_client():
+    """
+    Cliente Motor único para toda a sessão de testes.
+
+    O pool de conexões é reaproveitado por todos os módulos; cada módulo cria
+    (e descarta) o seu próprio banco de teste a partir deste cliente. Os testes
+    que o utilizam precisam rodar no event loop da sessão.
+    """
+    client = AsyncIOMotorClient(MONGODB_TEST_URL, maxPoolSize=50)
+    yield client
+    client.close()
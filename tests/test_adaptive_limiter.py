@@ -0,0 +1,85 @@
+"""Testes unitários para AdaptiveLimiter."""
+
+import asyncio
+
+import pytest
+
+from app.utils.adaptive_limiter import AdaptiveLimiter
+
+
+def test_rate_limit_halves_limit():
+    """Testa que 429 e 5xx reduzem o limite pela metade, respeitando o mínimo."""
+    limiter = AdaptiveLimiter(10, min_limit=2)
+
+    limiter.report(429)
+    assert limiter.limit == 5
+
+    limiter.report(503)
+    assert limiter.limit == 2
+
+    limiter.report(429)
+    assert limiter.limit == 2
+
+
+def test_successes_increase_limit():
+    """Testa que sucessos consecutivos aumentam o limite em uma unidade."""
+    limiter = AdaptiveLimiter(4, max_limit=5, increase_after=3)
+
+    for _ in range(3):
+        limiter.report(200)
+    assert limiter.limit == 5
+
+    # Já no máximo: não aumenta mais
+    for _ in range(3):
+        limiter.report(200)
+    assert limiter.limit == 5
+
+
+def test_rate_limit_resets_success_streak():
+    """Testa que um 429 zera a sequência de sucessos."""
+    limiter = AdaptiveLimiter(4, increase_after=3)
+
+    limiter.report(200)
+    limiter.report(200)
+    limiter.report(429)
+    limiter.report(200)
+    limiter.report(200)
+
+    assert limiter.limit == 2
+
+
+@pytest.mark.asyncio
+async def test_acquire_respects_current_limit():
+    """Testa que no máximo `limit` operações executam ao mesmo tempo."""
+    limiter = AdaptiveLimiter(2)
+    running = 0
+    peak = 0
+
+    async def worker():
+        nonlocal running, peak
+        async with limiter:
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0)
+            running -= 1
+
+    await asyncio.gather(*(worker() for _ in range(6)))
+
+    assert peak == 2
+
+
+@pytest.mark.asyncio
+async def test_increase_wakes_waiters():
+    """Testa que aumentar o limite libera quem está aguardando."""
+    limiter = AdaptiveLimiter(1, increase_after=1)
+    await limiter.acquire()
+
+    waiter = asyncio.create_task(limiter.acquire())
+    await asyncio.sleep(0)
+    assert not waiter.done()
+
+    limiter.report(200)
+    await asyncio.wait_for(waiter, timeout=1)
+
+    limiter.release()
+    limiter.release()
@@ -103,3 +103,13 @@ def test_boss_model_with_int_values():
     boss = BossModel(name="Test", hp=50000, exp=10000)
     assert boss.hp == 50000
     assert boss.exp == 10000
+
+
+def test_boss_model_get_slug_follows_name_changes():
+    """Testa que o slug em cache é regenerado quando o nome muda."""
+    boss = BossModel(name="The Lord of the Lice")
+    assert boss.get_slug() == "the-lord-of-the-lice"
+
+    boss.name = "Morgaroth"
+    assert boss.get_slug() == "morgaroth"
+    assert "_slug_cache" not in boss.model_dump()
@@ -1,91 +1,106 @@
 """Testes para o endpoint de listagem de bosses."""
 
 import pytest
+import pytest_asyncio
 from httpx import ASGITransport, AsyncClient
 from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
 
-from app.core.database import get_database
+from app.core.database import _create_indexes, get_database
 from app.db.repository import BossRepository
 from app.main import app
 from app.models.boss import BossModel, BossVisuals
+from tests.conftest import worker_database_name
 
+# Todos os testes rodam no event loop da sessão, o mesmo da conexão com o MongoDB,
+# para que a conexão e os dados de teste sejam criados uma única vez
+pytestmark = pytest.mark.asyncio(loop_scope="session")
 
-@pytest.fixture
-async def test_database() -> AsyncIOMotorDatabase:
+
+TEST_DATABASE_NAME = worker_database_name("tibia_bosses_endpoint_test")
+
+
+@pytest_asyncio.fixture(scope="module", loop_scope="session")
+async def test_database(motor_client: AsyncIOMotorClient) -> AsyncIOMotorDatabase:
     """Fixture para criar um banco de dados de teste isolado."""
-    client = AsyncIOMotorClient("mongodb://localhost:27017")
-    db = client["tibia_bosses_test"]
-    await client.drop_database("tibia_bosses_test")
+    await motor_client.drop_database(TEST_DATABASE_NAME)
+    db = motor_client[TEST_DATABASE_NAME]
+    # Mesmos índices da aplicação, para que os planos de consulta sejam os de produção
+    await _create_indexes(db)
     yield db
-    await client.drop_database("tibia_bosses_test")
-    client.close()
+    await motor_client.drop_database(TEST_DATABASE_NAME)
 
 
-@pytest.fixture
+@pytest_asyncio.fixture(scope="module", loop_scope="session")
 async def populated_repository(test_database: AsyncIOMotorDatabase):
     """Fixture que popula o banco com dados de teste."""
     repository = BossRepository(test_database)
     await repository.collection.delete_many({})
 
-    bosses = []
-    for i in range(1, 16):
-        boss = BossModel(
-            name=f"Test Boss {i:02d}",
-            hp=10000 * i,
-            exp=5000 * i,
-            visuals=BossVisuals(
-                gif_url=f"https://example.com/boss{i}.gif",
-                filename=f"boss{i}.gif",
-            ),
+    # Documentos no mesmo formato gravado pelo repositório, inseridos num único insert_many
+    # (banco recém-criado: não há o que atualizar, então o upsert é dispensável)
+    documents = [
+        BossRepository._to_document(
+            BossModel(
+                name=f"Test Boss {i:02d}",
+                hp=10000 * i,
+                exp=5000 * i,
+                visuals=BossVisuals(
+                    gif_url=f"https://example.com/boss{i}.gif",
+                    filename=f"boss{i}.gif",
+                ),
+            )
         )
-        bosses.append(boss)
-
-    await repository.upsert_batch(bosses)
+        for i in range(1, 16)
+    ]
+    await repository.collection.insert_many(documents, ordered=False)
     return repository
 
 
-@pytest.fixture
+@pytest_asyncio.fixture(scope="module", loop_scope="session")
 async def client(test_database, populated_repository):
     """Fixture para criar um cliente HTTP assíncrono para os testes."""
-    # Usa dependency_overrides do FastAPI para injetar o banco de teste
+    # Usa dependency_overrides do FastAPI para injetar o banco de teste (uma vez por módulo)
     app.dependency_overrides[get_database] = lambda: test_database
 
     # Usa AsyncClient com ASGITransport para evitar problemas de thread/loop
     async with AsyncClient(transport=ASGITransport(app=app), base_url="http://testserver") as ac:
         yield ac
 
-    app.dependency_overrides = {}
+    # Remove apenas o override registrado aqui
+    app.dependency_overrides.pop(get_database, None)
 
 
-@pytest.mark.asyncio
-async def test_list_bosses_default_pagination(client):
-    """Testa listagem com paginação padrão."""
-    response = await client.get("/api/v1/bosses")
+# (query string, status esperado, campos esperados na resposta paginada)
+PAGINATION_CASES = [
+    # Paginação padrão
+    ("", 200, {"total": 15, "page": 1, "size": 15, "pages": 1}),
+    # Limit customizado
+    ("?limit=5", 200, {"total": 15, "page": 1, "size": 5, "pages": 3}),
+    # Metadados de uma página intermediária
+    ("?page=2&limit=5", 200, {"total": 15, "page": 2, "size": 5, "pages": 3}),
+    # Limite máximo de 100 é respeitado
+    ("?limit=150", 422, None),
+    # Página inválida
+    ("?page=0", 422, None),
+]
 
-    assert response.status_code == 200
-    data = response.json()
 
-    assert "items" in data
-    assert "total" in data
-    assert data["total"] == 15
-    assert data["page"] == 1
-    assert data["size"] <= 20
+@pytest.mark.parametrize("query_string,expected_status,expected", PAGINATION_CASES)
+async def test_list_bosses_pagination(client, query_string, expected_status, expected):
+    """Testa a paginação da listagem (valores padrão, limit, metadados e validação)."""
+    response = await client.get(f"/api/v1/bosses{query_string}")
 
+    assert response.status_code == expected_status
+    if expected is None:
+        return
 
-@pytest.mark.asyncio
-async def test_list_bosses_custom_limit(client):
-    """Testa listagem com limit customizado."""
-    response = await client.get("/api/v1/bosses?limit=5")
-
-    assert response.status_code == 200
     data = response.json()
-
-    assert len(data["items"]) == 5
-    assert data["size"] == 5
-    assert data["page"] == 1
+    assert "items" in data
+    assert len(data["items"]) == expected["size"]
+    for key, value in expected.items():
+        assert data[key] == value
 
 
-@pytest.mark.asyncio
 async def test_list_bosses_pagination_page_2(client):
     """Testa que página 2 traz itens diferentes da página 1."""
     # Página 1
@@ -100,27 +115,43 @@ async def test_list_bosses_pagination_page_2(client):
     data_page2 = response_page2.json()
     items_page2 = [item["name"] for item in data_page2["items"]]
 
-    # Verifica que são diferentes
+    # Verifica que são diferentes (nenhum item da página 1 reaparece na página 2)
     assert items_page1 != items_page2
-    assert len(set(items_page1) & set(items_page2)) == 0
+    assert frozenset(items_page1).isdisjoint(items_page2)
 
 
-@pytest.mark.asyncio
-async def test_list_bosses_metadata(client):
-    """Testa que os metadados de paginação estão corretos."""
-    # Popula o banco via fixture populated_repository
-    response = await client.get("/api/v1/bosses?page=2&limit=5")
+async def test_list_bosses_estimated_count(client):
+    """Testa que estimate=true usa a contagem estimada e sinaliza isso na resposta."""
+    response = await client.get("/api/v1/bosses?limit=5&estimate=true")
+    assert response.status_code == 200
+
+    data = response.json()
+    assert data["total_estimated"] is True
+    assert abs(data["total"] - 15) <= 1.5  # ±10% dos 15 bosses
+    assert len(data["items"]) == 5
+
+    # Sem o parâmetro, a contagem continua exata
+    response = await client.get("/api/v1/bosses?limit=5")
+    assert response.json()["total_estimated"] is False
+
 
+async def test_list_bosses_range_pagination(client):
+    """Testa a paginação por cursor (after=<slug>): retorna os slugs seguintes, em ordem."""
+    response = await client.get("/api/v1/bosses?after=test-boss-05&limit=5")
     assert response.status_code == 200
+
     data = response.json()
+    assert [item["slug"] for item in data["items"]] == [f"test-boss-{i:02d}" for i in range(6, 11)]
+    # Sem posição por página no modo cursor; a próxima página parte do último slug
+    assert (data["page"], data["pages"], data["next_after"]) == (None, None, "test-boss-10")
 
-    assert data["total"] == 15
-    assert data["page"] == 2
-    assert data["size"] == 5
-    assert data["pages"] == 3
+    # A última página por cursor termina sem itens extras e sem próximo cursor
+    response = await client.get("/api/v1/bosses?after=test-boss-13&limit=5")
+    data = response.json()
+    assert [item["slug"] for item in data["items"]] == ["test-boss-14", "test-boss-15"]
+    assert data["next_after"] is None
 
 
-@pytest.mark.asyncio
 async def test_list_bosses_projection_excludes_raw_wikitext(client):
     """Testa que a projection não retorna campos pesados."""
     response = await client.get("/api/v1/bosses?limit=1")
@@ -138,21 +169,6 @@ async def test_list_bosses_projection_excludes_raw_wikitext(client):
     assert "immunities" not in item
 
 
-@pytest.mark.asyncio
-async def test_list_bosses_max_limit(client):
-    """Testa que o limite máximo de 100 é respeitado."""
-    response = await client.get("/api/v1/bosses?limit=150")
-    assert response.status_code == 422
-
-
-@pytest.mark.asyncio
-async def test_list_bosses_invalid_page(client):
-    """Testa validação de página inválida."""
-    response = await client.get("/api/v1/bosses?page=0")
-    assert response.status_code == 422
-
-
-@pytest.mark.asyncio
 async def test_search_and_get_slug_routing(client):
     """Testa que as rotas /search e /{slug} funcionam corretamente sem conflito."""
     # 1. Testa busca
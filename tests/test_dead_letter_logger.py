@@ -1,14 +1,83 @@
 """Testes para o Dead Letter Logger."""
 
 import json
-import tempfile
-from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
 
 import pytest
 
-from app.services.wikitext_parser import ParserError
+from app.services.wikitext_parser import ParserError, WikitextParser
 from app.utils.dead_letter_logger import DeadLetterLogger
 
+# Wikitext que causaria erro de parsing (sem template Infobox)
+INVALID_WIKITEXT = """
+    == Description ==
+    This is a boss description.
+    No Infobox template here.
+    """
+
+# (método do logger, boss, erro, dado bruto, trecho esperado no erro, snippet esperado)
+READBACK_CASES = [
+    pytest.param(
+        "log_parsing_error",
+        "Morgaroth",
+        ParserError("Template não encontrado"),
+        "Some wikitext content here",
+        "Template não encontrado",
+        "Some wikitext content here",
+        id="required-fields",
+    ),
+    pytest.param(
+        "log_parsing_error",
+        "Long Snippet Boss",
+        ParserError("Erro de parsing"),
+        "A" * 1000,
+        "Erro de parsing",
+        "A" * 500 + "...",  # Truncado em 500 + "..."
+        id="truncates-long-snippet",
+    ),
+    pytest.param(
+        "log_parsing_error",
+        "Empty Data Boss",
+        ParserError("Erro sem dados"),
+        None,
+        "Erro sem dados",
+        "",
+        id="empty-raw-data",
+    ),
+    pytest.param(
+        "log_image_error",
+        "Image Boss",
+        Exception("Imagem não encontrada"),
+        "File:Test.gif",
+        "Imagem não encontrada",
+        "Image filename: File:Test.gif",
+        id="image-error",
+    ),
+    pytest.param(
+        "log_parsing_error",
+        "Wikitext Boss",
+        ParserError("Template 'Infobox Boss' ou 'Infobox Creature' não encontrado no wikitext"),
+        INVALID_WIKITEXT,
+        "Template",
+        INVALID_WIKITEXT,
+        id="real-wikitext",
+    ),
+]
+
+
+@pytest.fixture(scope="module")
+def logged_entries(tmp_path_factory):
+    """Grava todos os READBACK_CASES em um único arquivo e devolve as entradas lidas, na ordem."""
+    log_file = tmp_path_factory.mktemp("dead_letter") / "readback_errors.jsonl"
+    logger = DeadLetterLogger(log_file=log_file)
+    for case in READBACK_CASES:
+        method, boss_name, error, raw_data = case.values[:4]
+        getattr(logger, method)(boss_name, error, raw_data)
+    logger.close()
+
+    return [json.loads(line) for line in log_file.read_text(encoding="utf-8").splitlines()]
+
 
 @pytest.fixture
 def temp_log_file(tmp_path):
@@ -21,10 +90,8 @@ def temp_log_file(tmp_path):
 def dead_letter_logger(temp_log_file):
     """Fixture para criar uma instância do logger com arquivo temporário."""
     logger = DeadLetterLogger(log_file=temp_log_file)
-    # Limpa o arquivo antes de cada teste
-    if temp_log_file.exists():
-        temp_log_file.unlink()
-    return logger
+    yield logger
+    logger.close()
 
 
 def test_log_parsing_error_creates_file(dead_letter_logger, temp_log_file):
@@ -35,55 +102,11 @@ def test_log_parsing_error_creates_file(dead_letter_logger, temp_log_file):
         error=error,
         raw_data="Some wikitext content",
     )
+    dead_letter_logger.flush()
 
     assert temp_log_file.exists()
 
 
-def test_log_parsing_error_contains_required_fields(dead_letter_logger, temp_log_file):
-    """Testa que o log contém todos os campos obrigatórios."""
-    error = ParserError("Template não encontrado")
-    dead_letter_logger.log_parsing_error(
-        boss_name="Morgaroth",
-        error=error,
-        raw_data="Some wikitext content here",
-    )
-
-    # Lê o arquivo de log
-    with open(temp_log_file, "r", encoding="utf-8") as f:
-        line = f.readline()
-        log_entry = json.loads(line)
-
-    # Verifica campos obrigatórios
-    assert "timestamp" in log_entry
-    assert "boss_name" in log_entry
-    assert "error_message" in log_entry
-    assert "raw_data_snippet" in log_entry
-
-    # Verifica valores
-    assert log_entry["boss_name"] == "Morgaroth"
-    assert "Template não encontrado" in log_entry["error_message"]
-
-
-def test_log_parsing_error_truncates_long_snippet(dead_letter_logger, temp_log_file):
-    """Testa que snippets longos são truncados para 500 caracteres."""
-    long_text = "A" * 1000  # Texto de 1000 caracteres
-    error = ParserError("Erro de parsing")
-
-    dead_letter_logger.log_parsing_error(
-        boss_name="Test Boss",
-        error=error,
-        raw_data=long_text,
-    )
-
-    with open(temp_log_file, "r", encoding="utf-8") as f:
-        line = f.readline()
-        log_entry = json.loads(line)
-
-    snippet = log_entry["raw_data_snippet"]
-    assert len(snippet) == 503  # 500 + "..."
-    assert snippet.endswith("...")
-
-
 def test_log_parsing_error_multiple_entries(dead_letter_logger, temp_log_file):
     """Testa que múltiplas entradas são escritas corretamente."""
     error1 = ParserError("Erro 1")
@@ -91,6 +114,7 @@ def test_log_parsing_error_multiple_entries(dead_letter_logger, temp_log_file):
 
     dead_letter_logger.log_parsing_error("Boss 1", error1, "Data 1")
     dead_letter_logger.log_parsing_error("Boss 2", error2, "Data 2")
+    dead_letter_logger.flush()
 
     # Lê todas as linhas
     with open(temp_log_file, "r", encoding="utf-8") as f:
@@ -105,41 +129,6 @@ def test_log_parsing_error_multiple_entries(dead_letter_logger, temp_log_file):
     assert entry2["boss_name"] == "Boss 2"
 
 
-def test_log_parsing_error_with_empty_raw_data(dead_letter_logger, temp_log_file):
-    """Testa que o log funciona mesmo com raw_data vazio."""
-    error = ParserError("Erro sem dados")
-
-    dead_letter_logger.log_parsing_error(
-        boss_name="Test Boss",
-        error=error,
-        raw_data=None,
-    )
-
-    with open(temp_log_file, "r", encoding="utf-8") as f:
-        line = f.readline()
-        log_entry = json.loads(line)
-
-    assert log_entry["raw_data_snippet"] == ""
-
-
-def test_log_image_error(dead_letter_logger, temp_log_file):
-    """Testa logging de erro de imagem."""
-    error = Exception("Imagem não encontrada")
-
-    dead_letter_logger.log_image_error(
-        boss_name="Test Boss",
-        error=error,
-        image_filename="File:Test.gif",
-    )
-
-    with open(temp_log_file, "r", encoding="utf-8") as f:
-        line = f.readline()
-        log_entry = json.loads(line)
-
-    assert log_entry["boss_name"] == "Test Boss"
-    assert "Image filename: File:Test.gif" in log_entry["raw_data_snippet"]
-
-
 def test_get_log_count(dead_letter_logger, temp_log_file):
     """Testa contagem de entradas no log."""
     assert dead_letter_logger.get_log_count() == 0
@@ -151,38 +140,91 @@ def test_get_log_count(dead_letter_logger, temp_log_file):
     assert dead_letter_logger.get_log_count() == 2
 
 
+def test_get_log_count_includes_existing_entries(temp_log_file):
+    """Testa que entradas gravadas antes da instância são contadas e zeradas no clear."""
+    temp_log_file.write_text('{"boss_name": "Old 1"}\n{"boss_name": "Old 2"}\n')
+    logger = DeadLetterLogger(log_file=temp_log_file)
+
+    assert logger.get_log_count() == 2
+
+    logger.log_parsing_error("Boss 1", ParserError("Erro"), "Data")
+    assert logger.get_log_count() == 3
+
+    logger.clear_logs()
+    assert logger.get_log_count() == 0
+    logger.close()
+
+
 def test_clear_logs(dead_letter_logger, temp_log_file):
     """Testa limpeza do arquivo de log."""
     dead_letter_logger.log_parsing_error("Boss 1", ParserError("Erro"), "Data")
+    dead_letter_logger.flush()
     assert temp_log_file.exists()
 
     dead_letter_logger.clear_logs()
     assert not temp_log_file.exists()
 
 
-def test_log_parsing_error_with_real_wikitext(dead_letter_logger, temp_log_file):
-    """Testa logging com wikitext real (simulando erro proposital)."""
-    # Wikitext que causaria erro (sem template Infobox)
-    invalid_wikitext = """
-    == Description ==
-    This is a boss description.
-    No Infobox template here.
-    """
+def test_logged_entries_order(logged_entries):
+    """Testa que cada chamada gerou exatamente uma linha, na ordem das chamadas."""
+    assert [entry["boss_name"] for entry in logged_entries] == [
+        case.values[1] for case in READBACK_CASES
+    ]
 
-    error = ParserError("Template 'Infobox Boss' ou 'Infobox Creature' não encontrado no wikitext")
 
-    dead_letter_logger.log_parsing_error(
-        boss_name="Test Boss",
-        error=error,
-        raw_data=invalid_wikitext,
-    )
+@pytest.mark.parametrize(
+    "method, boss_name, error, raw_data, expected_error, expected_snippet", READBACK_CASES
+)
+def test_logged_entry_readback(
+    logged_entries, method, boss_name, error, raw_data, expected_error, expected_snippet
+):
+    """Testa os campos de cada entrada gravada (campos obrigatórios, erro e snippet)."""
+    log_entry = next(entry for entry in logged_entries if entry["boss_name"] == boss_name)
 
-    with open(temp_log_file, "r", encoding="utf-8") as f:
-        line = f.readline()
-        log_entry = json.loads(line)
-
-    # Verifica que o snippet contém parte do wikitext
-    assert "Description" in log_entry["raw_data_snippet"]
-    assert len(log_entry["raw_data_snippet"]) <= 503  # Máximo 500 + "..."
-    assert log_entry["boss_name"] == "Test Boss"
-    assert "Template" in log_entry["error_message"]
+    # Verifica campos obrigatórios
+    assert set(log_entry) == {"timestamp", "boss_name", "error_message", "raw_data_snippet"}
+
+    # Verifica valores
+    assert log_entry["boss_name"] == boss_name
+    assert expected_error in log_entry["error_message"]
+    assert log_entry["raw_data_snippet"] == expected_snippet
+
+
+def test_writer_thread_lifecycle(temp_log_file):
+    """Testa que a thread de escrita só inicia no primeiro log e termina no close()."""
+    logger = DeadLetterLogger(log_file=temp_log_file)
+    assert logger._writer is None
+
+    logger.log_parsing_error("Boss 1", ParserError("Erro"), "Data")
+    writer = logger._writer
+    assert writer.is_alive()
+
+    logger.close()
+    assert not writer.is_alive()
+    assert logger.get_log_count() == 1
+
+    # Um novo log depois do close() reinicia a escrita no mesmo arquivo
+    logger.log_parsing_error("Boss 2", ParserError("Erro"), "Data")
+    assert logger.get_log_count() == 2
+    logger.close()
+
+
+def test_flush_without_writer_returns_immediately(dead_letter_logger):
+    """Testa que flush() não bloqueia quando não há thread de escrita viva."""
+    assert dead_letter_logger.flush(timeout=0.1) is True
+
+
+def test_summary_uses_worker_traceback(dead_letter_logger, temp_log_file):
+    """Testa que erros vindos do pool de processos mostram os frames do worker."""
+    with ProcessPoolExecutor(max_workers=1, mp_context=get_context("spawn")) as pool:
+        future = pool.submit(WikitextParser.parse, "Texto sem template.", "Worker Boss")
+        with pytest.raises(ParserError) as exc_info:
+            future.result()
+
+    dead_letter_logger.log_parsing_error("Worker Boss", exc_info.value, "Texto sem template.")
+    dead_letter_logger.flush()
+
+    (entry,) = [json.loads(line) for line in temp_log_file.read_text().splitlines()]
+    # O frame do parser (executado no worker) aparece no resumo
+    assert "wikitext_parser.py" in entry["error_message"]
+    assert entry["error_message"].endswith("não encontrado no wikitext")
@@ -1,304 +1,201 @@
 """Testes unitários para ImageResolverService."""
 
-from unittest.mock import AsyncMock, MagicMock, patch
+from urllib.parse import parse_qs
 
+import httpx
 import pytest
 
 from app.services.image_resolver import PLACEHOLDER_URL, ImageResolverService
 
+pytestmark = pytest.mark.asyncio
 
-@pytest.fixture
-def mock_httpx_response():
-    """Fixture para criar respostas mockadas do httpx."""
-
-    def _create_response(status_code=200, json_data=None):
-        response = MagicMock()
-        response.status_code = status_code
-        response.json.return_value = json_data or {}
-        response.raise_for_status = MagicMock()
-        return response
 
-    return _create_response
+def _page(title, url=None, **extra):
+    """Monta uma página de arquivo no formato da API (formatversion=2)."""
+    page = {"title": title, "imageinfo": [{"url": url}] if url else []}
+    page.update(extra)
+    return page
 
 
-@pytest.fixture
-def image_resolver():
-    """Fixture para criar uma instância do ImageResolverService."""
-    return ImageResolverService()
+# 55 arquivos: um lote completo (50) + um lote parcial (5)
+_BOSS_FILENAMES = tuple(f"File:Boss{i}.gif" for i in range(55))
 
 
-@pytest.mark.asyncio
-async def test_resolve_images_single_batch(image_resolver, mock_httpx_response):
-    """Testa resolução de imagens em um único lote (< 50)."""
-    mock_data = {
-        "query": {
-            "pages": {
-                "123": {
-                    "pageid": 123,
-                    "title": "File:Morgaroth.gif",
-                    "imageinfo": [{"url": "https://example.com/Morgaroth.gif"}],
-                },
-                "456": {
-                    "pageid": 456,
-                    "title": "File:Abyssador.gif",
-                    "imageinfo": [{"url": "https://example.com/Abyssador.gif"}],
-                },
-            }
-        }
+def _boss_pages(lo, hi):
+    """Monta as páginas de File:Boss{lo}.gif até File:Boss{hi - 1}.gif, indexadas pelo título."""
+    return {
+        title: _page(title, f"https://example.com/Boss{i}.gif")
+        for i, title in enumerate(_BOSS_FILENAMES[lo:hi], start=lo)
     }
 
-    with patch.object(image_resolver, "_client", new_callable=AsyncMock) as mock_client:
-        mock_client.post = AsyncMock(return_value=mock_httpx_response(json_data=mock_data))
 
-        filenames = ["File:Morgaroth.gif", "File:Abyssador.gif"]
-        results = await image_resolver.resolve_images(filenames)
+@pytest.fixture
+def wiki_api():
+    """
+    Estado da API simulada do TibiaWiki.
 
-        assert len(results) == 2
-        assert results["File:Morgaroth.gif"] == "https://example.com/Morgaroth.gif"
-        assert results["File:Abyssador.gif"] == "https://example.com/Abyssador.gif"
-        mock_client.post.assert_called_once()
+    - pages: página retornada para cada título solicitado
+    - errors: status HTTP (int) ou exceção para requisições que incluam o título
+    - requests: requisições recebidas, na ordem
+    """
+    return {"pages": {}, "errors": {}, "requests": []}
 
 
-@pytest.mark.asyncio
-async def test_resolve_images_multiple_batches(image_resolver, mock_httpx_response):
-    """Testa resolução de 55 imagens (2 lotes: 50 + 5)."""
-    # Cria 55 nomes de arquivos
-    filenames = [f"File:Boss{i}.gif" for i in range(55)]
-
-    # Mock para o primeiro lote (50 imagens)
-    mock_data_batch1 = {
-        "query": {
-            "pages": {
-                str(i): {
-                    "pageid": i,
-                    "title": f"File:Boss{i}.gif",
-                    "imageinfo": [{"url": f"https://example.com/Boss{i}.gif"}],
-                }
-                for i in range(50)
-            }
-        }
-    }
+@pytest.fixture
+async def image_resolver(wiki_api):
+    """Fixture para criar um ImageResolverService ligado à API simulada via MockTransport."""
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        wiki_api["requests"].append(request)
+        titles = parse_qs(request.content.decode())["titles"][0].split("|")
+
+        for title in titles:
+            error = wiki_api["errors"].get(title)
+            if isinstance(error, Exception):
+                raise error
+            if error is not None:
+                return httpx.Response(error)
+
+        pages = [wiki_api["pages"][title] for title in titles if title in wiki_api["pages"]]
+        return httpx.Response(200, json={"query": {"pages": pages}})
+
+    resolver = ImageResolverService()
+    resolver._client = httpx.AsyncClient(
+        base_url=resolver.base_url, transport=httpx.MockTransport(handler)
+    )
+    yield resolver
+    await resolver.close()
 
-    # Mock para o segundo lote (5 imagens)
-    mock_data_batch2 = {
-        "query": {
-            "pages": {
-                str(i): {
-                    "pageid": i,
-                    "title": f"File:Boss{i}.gif",
-                    "imageinfo": [{"url": f"https://example.com/Boss{i}.gif"}],
-                }
-                for i in range(50, 55)
-            }
-        }
-    }
 
-    with patch.object(image_resolver, "_client", new_callable=AsyncMock) as mock_client:
-        mock_client.post = AsyncMock(
-            side_effect=[
-                mock_httpx_response(json_data=mock_data_batch1),
-                mock_httpx_response(json_data=mock_data_batch2),
-            ]
-        )
+async def test_resolve_images_single_batch(image_resolver, wiki_api):
+    """Testa resolução de imagens em um único lote (< 50)."""
+    for name in ("Morgaroth", "Abyssador"):
+        title = f"File:{name}.gif"
+        wiki_api["pages"][title] = _page(title, f"https://example.com/{name}.gif")
 
-        results = await image_resolver.resolve_images(filenames)
+    filenames = ["File:Morgaroth.gif", "File:Abyssador.gif"]
+    results = await image_resolver.resolve_images(filenames)
 
-        # Verifica que foram feitos 2 requests
-        assert mock_client.post.call_count == 2
+    assert len(results) == 2
+    assert results["File:Morgaroth.gif"] == "https://example.com/Morgaroth.gif"
+    assert results["File:Abyssador.gif"] == "https://example.com/Abyssador.gif"
+    assert len(wiki_api["requests"]) == 1
 
-        # Verifica que todas as 55 imagens foram resolvidas
-        assert len(results) == 55
 
-        # Verifica algumas URLs
-        assert results["File:Boss0.gif"] == "https://example.com/Boss0.gif"
-        assert results["File:Boss54.gif"] == "https://example.com/Boss54.gif"
+async def test_resolve_images_multiple_batches(image_resolver, wiki_api):
+    """Testa resolução de 55 imagens (2 lotes: 50 + 5)."""
+    wiki_api["pages"].update(_boss_pages(0, 55))
 
+    results = await image_resolver.resolve_images(_BOSS_FILENAMES)
 
-@pytest.mark.asyncio
-async def test_resolve_images_missing_image(image_resolver, mock_httpx_response):
-    """Testa que imagens não encontradas recebem placeholder."""
-    mock_data = {
-        "query": {
-            "pages": {
-                "123": {
-                    "pageid": 123,
-                    "title": "File:Morgaroth.gif",
-                    "imageinfo": [{"url": "https://example.com/Morgaroth.gif"}],
-                },
-                "456": {
-                    "pageid": 456,
-                    "title": "File:Missing.gif",
-                    "missing": True,
-                },
-            }
-        }
-    }
+    # Verifica que foram feitos 2 requests
+    assert len(wiki_api["requests"]) == 2
 
-    with patch.object(image_resolver, "_client", new_callable=AsyncMock) as mock_client:
-        mock_client.post = AsyncMock(return_value=mock_httpx_response(json_data=mock_data))
+    # Verifica que todas as 55 imagens foram resolvidas
+    assert len(results) == 55
 
-        filenames = ["File:Morgaroth.gif", "File:Missing.gif"]
-        results = await image_resolver.resolve_images(filenames)
+    # Verifica algumas URLs
+    assert results["File:Boss0.gif"] == "https://example.com/Boss0.gif"
+    assert results["File:Boss54.gif"] == "https://example.com/Boss54.gif"
 
-        assert results["File:Morgaroth.gif"] == "https://example.com/Morgaroth.gif"
-        assert results["File:Missing.gif"] == PLACEHOLDER_URL
 
+async def test_resolve_images_missing_image(image_resolver, wiki_api):
+    """Testa que imagens não encontradas recebem placeholder."""
+    wiki_api["pages"]["File:Morgaroth.gif"] = _page(
+        "File:Morgaroth.gif", "https://example.com/Morgaroth.gif"
+    )
+    wiki_api["pages"]["File:Missing.gif"] = {"title": "File:Missing.gif", "missing": True}
 
-@pytest.mark.asyncio
-async def test_resolve_images_empty_imageinfo(image_resolver, mock_httpx_response):
-    """Testa que imagens com imageinfo vazio recebem placeholder."""
-    mock_data = {
-        "query": {
-            "pages": {
-                "123": {
-                    "pageid": 123,
-                    "title": "File:NoImageInfo.gif",
-                    "imageinfo": [],
-                }
-            }
-        }
-    }
+    filenames = ["File:Morgaroth.gif", "File:Missing.gif"]
+    results = await image_resolver.resolve_images(filenames)
 
-    with patch.object(image_resolver, "_client", new_callable=AsyncMock) as mock_client:
-        mock_client.post = AsyncMock(return_value=mock_httpx_response(json_data=mock_data))
+    assert results["File:Morgaroth.gif"] == "https://example.com/Morgaroth.gif"
+    assert results["File:Missing.gif"] == PLACEHOLDER_URL
 
-        filenames = ["File:NoImageInfo.gif"]
-        results = await image_resolver.resolve_images(filenames)
 
-        assert results["File:NoImageInfo.gif"] == PLACEHOLDER_URL
+async def test_resolve_images_empty_imageinfo(image_resolver, wiki_api):
+    """Testa que imagens com imageinfo vazio recebem placeholder."""
+    wiki_api["pages"]["File:NoImageInfo.gif"] = _page("File:NoImageInfo.gif")
 
+    filenames = ["File:NoImageInfo.gif"]
+    results = await image_resolver.resolve_images(filenames)
 
-@pytest.mark.asyncio
-async def test_resolve_images_http_error(image_resolver, mock_httpx_response):
-    """Testa que erros HTTP não fazem o sistema crashar."""
-    from httpx import HTTPStatusError
+    assert results["File:NoImageInfo.gif"] == PLACEHOLDER_URL
 
-    error_response = MagicMock()
-    error_response.status_code = 500
-    http_error = HTTPStatusError(
-        "Internal Server Error", request=MagicMock(), response=error_response
-    )
 
-    with patch.object(image_resolver, "_client", new_callable=AsyncMock) as mock_client:
-        mock_client.post = AsyncMock(side_effect=http_error)
+async def test_resolve_images_http_error(image_resolver, wiki_api):
+    """Testa que erros HTTP não fazem o sistema crashar."""
+    wiki_api["errors"]["File:Error.gif"] = 500
 
-        filenames = ["File:Error.gif"]
-        results = await image_resolver.resolve_images(filenames)
+    filenames = ["File:Error.gif"]
+    results = await image_resolver.resolve_images(filenames)
 
-        # Sistema não crashou, atribuiu placeholder
-        assert results["File:Error.gif"] == PLACEHOLDER_URL
+    # Sistema não crashou, atribuiu placeholder
+    assert results["File:Error.gif"] == PLACEHOLDER_URL
 
 
-@pytest.mark.asyncio
-async def test_resolve_images_general_exception(image_resolver):
+async def test_resolve_images_general_exception(image_resolver, wiki_api):
     """Testa que exceções gerais não fazem o sistema crashar."""
-    with patch.object(image_resolver, "_client", new_callable=AsyncMock) as mock_client:
-        mock_client.post = AsyncMock(side_effect=Exception("Erro inesperado"))
+    wiki_api["errors"]["File:Exception.gif"] = Exception("Erro inesperado")
 
-        filenames = ["File:Exception.gif"]
-        results = await image_resolver.resolve_images(filenames)
+    filenames = ["File:Exception.gif"]
+    results = await image_resolver.resolve_images(filenames)
 
-        # Sistema não crashou, atribuiu placeholder
-        assert results["File:Exception.gif"] == PLACEHOLDER_URL
+    # Sistema não crashou, atribuiu placeholder
+    assert results["File:Exception.gif"] == PLACEHOLDER_URL
 
 
-@pytest.mark.asyncio
-async def test_resolve_images_empty_list(image_resolver):
+async def test_resolve_images_empty_list(image_resolver, wiki_api):
     """Testa resolução de lista vazia."""
     results = await image_resolver.resolve_images([])
     assert results == {}
+    assert wiki_api["requests"] == []
 
 
-@pytest.mark.asyncio
-async def test_resolve_images_duplicates(image_resolver, mock_httpx_response):
+async def test_resolve_images_duplicates(image_resolver, wiki_api):
     """Testa que duplicatas são removidas antes do processamento."""
-    mock_data = {
-        "query": {
-            "pages": {
-                "123": {
-                    "pageid": 123,
-                    "title": "File:Duplicate.gif",
-                    "imageinfo": [{"url": "https://example.com/Duplicate.gif"}],
-                }
-            }
-        }
-    }
-
-    with patch.object(image_resolver, "_client", new_callable=AsyncMock) as mock_client:
-        mock_client.post = AsyncMock(return_value=mock_httpx_response(json_data=mock_data))
-
-        # Lista com duplicatas
-        filenames = ["File:Duplicate.gif", "File:Duplicate.gif", "File:Duplicate.gif"]
-        results = await image_resolver.resolve_images(filenames)
-
-        # Deve fazer apenas 1 request (duplicatas removidas)
-        assert mock_client.post.call_count == 1
-        assert len(results) == 1
-        assert results["File:Duplicate.gif"] == "https://example.com/Duplicate.gif"
+    wiki_api["pages"]["File:Duplicate.gif"] = _page(
+        "File:Duplicate.gif", "https://example.com/Duplicate.gif"
+    )
 
+    # Lista com duplicatas
+    filenames = ["File:Duplicate.gif", "File:Duplicate.gif", "File:Duplicate.gif"]
+    results = await image_resolver.resolve_images(filenames)
 
-@pytest.mark.asyncio
-async def test_resolve_images_uses_post_not_get(image_resolver, mock_httpx_response):
-    """Testa que a requisição usa POST e não GET."""
-    mock_data = {"query": {"pages": {}}}
+    # Deve fazer apenas 1 request (duplicatas removidas)
+    assert len(wiki_api["requests"]) == 1
+    assert len(results) == 1
+    assert results["File:Duplicate.gif"] == "https://example.com/Duplicate.gif"
 
-    with patch.object(image_resolver, "_client", new_callable=AsyncMock) as mock_client:
-        mock_client.post = AsyncMock(return_value=mock_httpx_response(json_data=mock_data))
 
-        filenames = ["File:Test.gif"]
-        await image_resolver.resolve_images(filenames)
+async def test_resolve_images_uses_post_not_get(image_resolver, wiki_api):
+    """Testa que a requisição usa POST (títulos no body) e não GET."""
+    filenames = ["File:Test.gif"]
+    await image_resolver.resolve_images(filenames)
 
-        # Verifica que foi usado POST
-        mock_client.post.assert_called_once()
-        # Verifica que não foi usado GET
-        assert not hasattr(mock_client, "get") or mock_client.get.call_count == 0
+    # Verifica que foi usado POST, sem os títulos na URL
+    (request,) = wiki_api["requests"]
+    assert request.method == "POST"
+    assert "titles" not in request.url.params
 
 
-@pytest.mark.asyncio
-async def test_resolve_images_batch_error_does_not_crash(image_resolver, mock_httpx_response):
+async def test_resolve_images_batch_error_does_not_crash(image_resolver, wiki_api):
     """Testa que erro em um lote não impede o processamento dos outros."""
-    # Primeiro lote com erro
-    from httpx import HTTPStatusError
-
-    error_response = MagicMock()
-    error_response.status_code = 500
-    http_error = HTTPStatusError(
-        "Internal Server Error", request=MagicMock(), response=error_response
-    )
+    # 55 imagens (2 lotes); o primeiro lote falha
+    wiki_api["errors"]["File:Boss0.gif"] = 500
 
     # Segundo lote com sucesso (5 imagens)
-    mock_data_batch2 = {
-        "query": {
-            "pages": {
-                str(i): {
-                    "pageid": i,
-                    "title": f"File:Boss{i}.gif",
-                    "imageinfo": [{"url": f"https://example.com/Boss{i}.gif"}],
-                }
-                for i in range(50, 55)
-            }
-        }
-    }
-
-    with patch.object(image_resolver, "_client", new_callable=AsyncMock) as mock_client:
-        mock_client.post = AsyncMock(
-            side_effect=[
-                http_error,  # Primeiro lote falha
-                mock_httpx_response(json_data=mock_data_batch2),  # Segundo lote sucesso
-            ]
-        )
+    wiki_api["pages"].update(_boss_pages(50, 55))
 
-        # 55 imagens (2 lotes)
-        filenames = [f"File:Boss{i}.gif" for i in range(55)]
-        results = await image_resolver.resolve_images(filenames)
+    results = await image_resolver.resolve_images(_BOSS_FILENAMES)
 
-        # Sistema não crashou
-        assert len(results) == 55
+    # Sistema não crashou
+    assert len(results) == 55
 
-        # Primeiro lote recebeu placeholders
-        for i in range(50):
-            assert results[f"File:Boss{i}.gif"] == PLACEHOLDER_URL
+    # Primeiro lote recebeu placeholders (a própria constante do módulo)
+    for filename in _BOSS_FILENAMES[:50]:
+        assert results[filename] is PLACEHOLDER_URL
 
-        # Segundo lote foi resolvido corretamente
-        for i in range(50, 55):
-            assert results[f"File:Boss{i}.gif"] == f"https://example.com/Boss{i}.gif"
+    # Segundo lote foi resolvido corretamente
+    for i, filename in enumerate(_BOSS_FILENAMES[50:], start=50):
+        assert results[filename] == f"https://example.com/Boss{i}.gif"
@@ -1,34 +1,50 @@
 """Testes de integração para BossRepository."""
 
 import pytest
-from motor.motor_asyncio import AsyncIOMotorDatabase
+import pytest_asyncio
+from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
 
-from app.db.connection import close_database, init_database
+from app.core.database import _create_indexes
 from app.db.repository import BossRepository
 from app.models.boss import BossModel, BossVisuals
+from tests.conftest import worker_database_name
 
+TEST_DATABASE_NAME = worker_database_name("tibia_bosses_repository_test")
 
-@pytest.fixture
-async def test_database():
-    """Fixture para criar um banco de dados de teste."""
+# Projection enxuta para as leituras que só conferem o que foi gravado
+LEAN_PROJECTION = {"name": 1, "hp": 1, "visuals": 1}
+
+# Os testes usam o cliente Motor da sessão (tests/conftest.py), preso ao loop da sessão
+pytestmark = pytest.mark.asyncio(loop_scope="session")
+
+
+@pytest_asyncio.fixture(scope="module", loop_scope="session")
+async def module_database(motor_client: AsyncIOMotorClient):
+    """Banco de teste do módulo: criado (com os índices) uma vez e descartado no fim."""
     # Usa um banco de teste diferente
-    db = await init_database(
-        mongodb_url="mongodb://localhost:27017",
-        database_name="tibia_bosses_test",
-    )
+    await motor_client.drop_database(TEST_DATABASE_NAME)
+    db = motor_client[TEST_DATABASE_NAME]
+    await _create_indexes(db)
     yield db
     # Limpa após os testes
-    await db.client.drop_database("tibia_bosses_test")
-    await close_database()
+    await motor_client.drop_database(TEST_DATABASE_NAME)
+
+
+@pytest_asyncio.fixture(loop_scope="session")
+async def test_database(module_database: AsyncIOMotorDatabase):
+    """Fixture que entrega o banco de teste vazio a cada teste (índices preservados)."""
+    # Esvazia as coleções em vez de derrubar o banco: os índices continuam valendo
+    for collection_name in await module_database.list_collection_names():
+        await module_database[collection_name].delete_many({})
+    return module_database
 
 
 @pytest.fixture
-async def repository(test_database: AsyncIOMotorDatabase):
+def repository(test_database: AsyncIOMotorDatabase):
     """Fixture para criar uma instância do repositório."""
     return BossRepository(test_database)
 
 
-@pytest.mark.asyncio
 async def test_upsert_creates_boss(repository: BossRepository):
     """Testa que upsert cria um novo boss."""
     boss = BossModel(
@@ -43,7 +59,7 @@ async def test_upsert_creates_boss(repository: BossRepository):
     assert result is True
 
     # Verifica que foi salvo
-    saved_boss = await repository.find_by_slug(boss.get_slug())
+    saved_boss = await repository.find_by_slug(boss.get_slug(), projection=LEAN_PROJECTION)
     assert saved_boss is not None
     assert saved_boss.name == "Test Boss"
     assert saved_boss.hp == 50000
@@ -51,7 +67,6 @@ async def test_upsert_creates_boss(repository: BossRepository):
     assert saved_boss.visuals.gif_url == "https://example.com/test.gif"
 
 
-@pytest.mark.asyncio
 async def test_upsert_idempotent(repository: BossRepository):
     """Testa que inserir o mesmo boss 2 vezes resulta em 1 documento (atualizado)."""
     boss = BossModel(
@@ -74,13 +89,12 @@ async def test_upsert_idempotent(repository: BossRepository):
     assert count == 1
 
     # Verifica que o documento foi atualizado
-    saved_boss = await repository.find_by_slug(boss.get_slug())
+    saved_boss = await repository.find_by_slug(boss.get_slug(), projection=LEAN_PROJECTION)
     assert saved_boss is not None
     assert saved_boss.hp == 35000  # HP atualizado
     assert saved_boss.name == "Idempotent Boss"
 
 
-@pytest.mark.asyncio
 async def test_upsert_batch(repository: BossRepository):
     """Testa upsert em lote."""
     bosses = [BossModel(name=f"Boss {i}", hp=10000 + i, exp=5000 + i) for i in range(5)]
@@ -94,7 +108,16 @@ async def test_upsert_batch(repository: BossRepository):
     assert count == 5
 
 
-@pytest.mark.asyncio
+async def test_list_bosses_after_slug(repository: BossRepository):
+    """Testa que list_bosses(after=slug) pagina por range no slug, sem skip."""
+    bosses = [BossModel(name=f"Test Boss {i:03d}", hp=1000 + i) for i in range(100)]
+    await repository.upsert_batch(bosses)
+
+    page = await repository.list_bosses(limit=5, after="test-boss-050")
+
+    assert [boss.slug for boss in page] == [f"test-boss-{i:03d}" for i in range(51, 56)]
+
+
 async def test_find_by_slug(repository: BossRepository):
     """Testa busca por slug."""
     boss = BossModel(
@@ -112,7 +135,6 @@ async def test_find_by_slug(repository: BossRepository):
     assert found.visuals.gif_url == "https://example.com/slug.gif"
 
 
-@pytest.mark.asyncio
 async def test_find_by_name(repository: BossRepository):
     """Testa busca por nome."""
     boss = BossModel(name="Name Test Boss", hp=25000)
@@ -126,7 +148,6 @@ async def test_find_by_name(repository: BossRepository):
     assert found.hp == 25000
 
 
-@pytest.mark.asyncio
 async def test_slug_generation(repository: BossRepository):
     """Testa que o slug é gerado automaticamente."""
     boss = BossModel(name="Morgaroth", hp=77000)
@@ -138,12 +159,11 @@ async def test_slug_generation(repository: BossRepository):
     await repository.upsert(boss)
 
     # Verifica que o slug foi gerado e salvo
-    saved_boss = await repository.find_by_slug("morgaroth")
+    saved_boss = await repository.find_by_slug("morgaroth", projection=LEAN_PROJECTION)
     assert saved_boss is not None
     assert saved_boss.name == "Morgaroth"
 
 
-@pytest.mark.asyncio
 async def test_slug_with_special_characters(repository: BossRepository):
     """Testa geração de slug com caracteres especiais."""
     boss = BossModel(name="The Lord of the Lice", hp=50000)
@@ -158,15 +178,13 @@ async def test_slug_with_special_characters(repository: BossRepository):
     assert saved_boss is not None
 
 
-@pytest.mark.asyncio
 async def test_index_created(test_database: AsyncIOMotorDatabase):
     """Testa que o índice único em slug foi criado."""
-    # Lista os índices da coleção
-    indexes = await test_database.bosses.list_indexes().to_list(length=10)
-
-    index_names = [idx["name"] for idx in indexes]
-
-    # Verifica que o índice slug existe e é único
-    slug_index = next((idx for idx in indexes if idx.get("key", {}).get("slug")), None)
-    assert slug_index is not None
-    assert slug_index.get("unique") is True
+    # Percorre os índices da coleção até encontrar o de slug
+    async for idx in test_database.bosses.list_indexes():
+        if idx.get("key", {}).get("slug"):
+            # Verifica que o índice slug é único
+            assert idx.get("unique") is True
+            break
+    else:
+        pytest.fail("Índice de slug não encontrado")
@@ -1,33 +1,46 @@
 """Testes para o lock distribuído em system_jobs."""
 
+import asyncio
+
 import pytest
-from motor.motor_asyncio import AsyncIOMotorDatabase
+import pytest_asyncio
+from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
 
-from app.db.connection import close_database, init_database
 from app.db.system_jobs import SystemJobsRepository
+from tests.conftest import worker_database_name
 
+TEST_DATABASE_NAME = worker_database_name("tibia_bosses_lock_test")
 
-@pytest.fixture
-async def test_database():
-    """Cria um banco de dados de teste isolado para system_jobs."""
-    db = await init_database(
-        mongodb_url="mongodb://localhost:27017",
-        database_name="tibia_bosses_lock_test",
-    )
-    yield db
+# Os testes usam o cliente Motor da sessão (tests/conftest.py), preso ao loop da sessão
+pytestmark = pytest.mark.asyncio(loop_scope="session")
 
-    await db.client.drop_database("tibia_bosses_lock_test")
-    await close_database()
 
+@pytest_asyncio.fixture(scope="module", loop_scope="session")
+async def test_database(motor_client: AsyncIOMotorClient):
+    """Cria um banco de dados de teste isolado para system_jobs (compartilhado pelo módulo)."""
+    await motor_client.drop_database(TEST_DATABASE_NAME)
+    yield motor_client[TEST_DATABASE_NAME]
 
-@pytest.mark.asyncio
-async def test_acquire_and_release_lock(test_database: AsyncIOMotorDatabase):
-    """Garante que o lock do scraper respeita acquire/release corretamente."""
-    repo = SystemJobsRepository(test_database)
+    await motor_client.drop_database(TEST_DATABASE_NAME)
+
+
+@pytest_asyncio.fixture(scope="module", loop_scope="session")
+async def repo(test_database: AsyncIOMotorDatabase):
+    """Repositório compartilhado pelo módulo, com o documento base do lock já criado."""
+    repository = SystemJobsRepository(test_database)
+    await repository.ensure_scraper_lock_document()
+    return repository
+
+
+@pytest_asyncio.fixture(autouse=True, loop_scope="session")
+async def release_lock(repo: SystemJobsRepository):
+    """Libera o lock ao fim de cada teste, para que todos comecem com o job idle."""
+    yield
+    await repo.release_scraper_lock()
 
-    # Garante documento base
-    await repo.ensure_scraper_lock_document()
 
+async def test_acquire_and_release_lock(repo: SystemJobsRepository):
+    """Garante que o lock do scraper respeita acquire/release corretamente."""
     # Primeiro acquire deve funcionar
     first = await repo.acquire_scraper_lock()
     assert first is True
@@ -42,3 +55,16 @@ async def test_acquire_and_release_lock(test_database: AsyncIOMotorDatabase):
     # Novo acquire deve voltar a funcionar
     third = await repo.acquire_scraper_lock()
     assert third is True
+
+
+async def test_concurrent_acquire(repo: SystemJobsRepository):
+    """Garante que, sob disputa, apenas uma tentativa simultânea adquire o lock."""
+    # Tentativas concorrentes (usam conexões distintas do pool do Motor)
+    results = await asyncio.gather(*(repo.acquire_scraper_lock() for _ in range(10)))
+
+    assert results.count(True) == 1
+    assert results.count(False) == 9
+
+    status = await repo.get_scraper_status()
+    assert status is not None
+    assert status.status == "running"
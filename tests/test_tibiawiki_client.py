@@ -1,244 +1,399 @@
 """Testes unitários para TibiaWikiClient."""
 
-from unittest.mock import AsyncMock, MagicMock, patch
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
 
+import httpx
 import pytest
+import pytest_asyncio
 
 from app.services.tibiawiki_client import TibiaWikiClient
 
+# Todos os testes do módulo compartilham o event loop da sessão (sem criar/fechar um loop por teste).
+# Nenhum teste faz I/O real: o timeout derruba regressões como um backoff que volta a dormir de verdade
+pytestmark = [pytest.mark.asyncio(loop_scope="session"), pytest.mark.timeout(1)]
+
+# Respostas da API (reaproveitadas entre os testes; o cliente não as altera)
+_WIKITEXT_BY_ID_DATA = {
+    "query": {
+        "pages": [
+            {
+                "pageid": 123,
+                "title": "Test Boss",
+                "revisions": [
+                    {"slots": {"main": {"content": "{{Infobox Boss|hp=50000|exp=10000}}"}}}
+                ],
+            }
+        ]
+    }
+}
+
+_WIKITEXT_BY_TITLE_DATA = {
+    "query": {
+        "pages": [
+            {
+                "pageid": 456,
+                "title": "Test Boss",
+                "revisions": [{"slots": {"main": {"content": "{{Infobox Boss|hp=30000}}"}}}],
+            }
+        ]
+    }
+}
+
+_MISSING_PAGE_DATA = {
+    "query": {
+        "pages": [
+            {
+                "pageid": 999,
+                "title": "Non-existent Boss",
+                "missing": True,
+            }
+        ]
+    }
+}
+
+_NO_REVISIONS_DATA = {
+    "query": {
+        "pages": [
+            {
+                "pageid": 123,
+                "title": "Test Boss",
+                "revisions": [],
+            }
+        ]
+    }
+}
+
+_WIKITEXT_PAGE = {
+    "query": {
+        "pages": [
+            {
+                "pageid": 123,
+                "title": "Test Boss",
+                "revisions": [{"slots": {"main": {"content": "{{Infobox Boss|hp=50000}}"}}}],
+            }
+        ]
+    }
+}
 
-@pytest.fixture
-def mock_httpx_response():
-    """Fixture para criar respostas mockadas do httpx."""
 
-    def _create_response(status_code=200, json_data=None):
-        response = MagicMock()
-        response.status_code = status_code
-        response.json.return_value = json_data or {}
-        response.raise_for_status = MagicMock()
-        return response
+def _create_response(status_code=200, json_data=None):
+    """Resposta mockada do httpx: os testes só leem status_code, json() e raise_for_status()."""
+    data = json_data or {}
+    return SimpleNamespace(
+        status_code=status_code, json=lambda: data, raise_for_status=lambda: None
+    )
 
-    return _create_response
 
+def _paginated(pages):
+    """
+    Monta as respostas de uma listagem de Category:Bosses paginada.
 
-@pytest.fixture
-def tibiawiki_client():
-    """Fixture para criar uma instância do TibiaWikiClient."""
-    return TibiaWikiClient()
-
-
-@pytest.mark.asyncio
-async def test_get_all_bosses_single_page(tibiawiki_client, mock_httpx_response):
-    """Testa get_all_bosses() quando há apenas uma página de resultados."""
-    mock_data = {
-        "query": {
-            "categorymembers": [
-                {"pageid": 1, "title": "Boss 1"},
-                {"pageid": 2, "title": "Boss 2"},
-            ]
-        }
-    }
+    Cada página, exceto a última, traz o token cmcontinue "page-<n>" da seguinte.
 
-    with patch.object(
-        tibiawiki_client, "_request_with_backoff", new_callable=AsyncMock
-    ) as mock_request:
-        mock_request.return_value = mock_httpx_response(json_data=mock_data)
-
-        bosses = await tibiawiki_client.get_all_bosses()
-
-        assert len(bosses) == 2
-        assert bosses[0]["title"] == "Boss 1"
-        assert bosses[1]["title"] == "Boss 2"
-        mock_request.assert_called_once()
-
-
-@pytest.mark.asyncio
-async def test_get_all_bosses_with_pagination(tibiawiki_client, mock_httpx_response):
-    """Testa get_all_bosses() com paginação (cmcontinue)."""
-    # Primeira página
-    mock_data_page1 = {
-        "query": {
-            "categorymembers": [
-                {"pageid": 1, "title": "Boss 1"},
-                {"pageid": 2, "title": "Boss 2"},
-            ]
-        },
-        "continue": {"cmcontinue": "next_page_token"},
-    }
+    Args:
+        pages: Lista de páginas, cada uma com a lista de categorymembers
+    """
+    responses = []
+    for index, members in enumerate(pages, 1):
+        data = {"query": {"categorymembers": members}}
+        if index < len(pages):
+            data["continue"] = {"cmcontinue": f"page-{index + 1}"}
+        responses.append(_create_response(json_data=data))
+    return responses
 
-    # Segunda página (última)
-    mock_data_page2 = {
-        "query": {
-            "categorymembers": [
-                {"pageid": 3, "title": "Boss 3"},
-            ]
-        }
-    }
 
-    with patch.object(
-        tibiawiki_client, "_request_with_backoff", new_callable=AsyncMock
-    ) as mock_request:
-        mock_request.side_effect = [
-            mock_httpx_response(json_data=mock_data_page1),
-            mock_httpx_response(json_data=mock_data_page2),
-        ]
+def _async_stub(*responses):
+    """
+    Corrotina que devolve as respostas informadas, uma por chamada.
 
-        bosses = await tibiawiki_client.get_all_bosses()
-
-        assert len(bosses) == 3
-        assert bosses[0]["title"] == "Boss 1"
-        assert bosses[2]["title"] == "Boss 3"
-        assert mock_request.call_count == 2
-
-
-@pytest.mark.asyncio
-async def test_get_boss_wikitext_by_pageid(tibiawiki_client, mock_httpx_response):
-    """Testa get_boss_wikitext() usando pageid."""
-    mock_data = {
-        "query": {
-            "pages": {
-                "123": {
-                    "pageid": 123,
-                    "title": "Test Boss",
-                    "revisions": [
-                        {"slots": {"main": {"*": "{{Infobox Boss|hp=50000|exp=10000}}"}}}
-                    ],
-                }
-            }
-        }
-    }
+    Alternativa leve ao AsyncMock para os testes que não verificam as chamadas.
+    """
+    remaining = iter(responses)
 
-    with patch.object(
-        tibiawiki_client, "_request_with_backoff", new_callable=AsyncMock
-    ) as mock_request:
-        mock_request.return_value = mock_httpx_response(json_data=mock_data)
+    async def _stub(*args, **kwargs):
+        return next(remaining)
 
-        wikitext = await tibiawiki_client.get_boss_wikitext(pageid=123)
+    return _stub
 
-        assert wikitext == "{{Infobox Boss|hp=50000|exp=10000}}"
-        mock_request.assert_called_once()
 
+def _bosses(*pageids):
+    """Categorymembers para os pageids informados (título "Boss <pageid>")."""
+    return [{"pageid": pageid, "title": f"Boss {pageid}"} for pageid in pageids]
 
-@pytest.mark.asyncio
-async def test_get_boss_wikitext_by_title(tibiawiki_client, mock_httpx_response):
-    """Testa get_boss_wikitext() usando title."""
-    mock_data = {
-        "query": {
-            "pages": {
-                "456": {
-                    "pageid": 456,
-                    "title": "Test Boss",
-                    "revisions": [{"slots": {"main": {"*": "{{Infobox Boss|hp=30000}}"}}}],
-                }
-            }
-        }
-    }
 
-    with patch.object(
-        tibiawiki_client, "_request_with_backoff", new_callable=AsyncMock
-    ) as mock_request:
-        mock_request.return_value = mock_httpx_response(json_data=mock_data)
+@pytest.fixture(scope="session")
+def mock_httpx_response():
+    """Fixture para criar respostas mockadas do httpx."""
+    return _create_response
 
-        wikitext = await tibiawiki_client.get_boss_wikitext(title="Test Boss")
 
-        assert wikitext == "{{Infobox Boss|hp=30000}}"
-        mock_request.assert_called_once()
+@pytest.fixture
+def mock_request(tibiawiki_client, monkeypatch):
+    """Substitui _request_with_backoff do cliente por um AsyncMock (desfeito ao fim do teste)."""
+    mock = AsyncMock()
+    monkeypatch.setattr(tibiawiki_client, "_request_with_backoff", mock)
+    return mock
 
 
-@pytest.mark.asyncio
-async def test_get_boss_wikitext_missing_page(tibiawiki_client, mock_httpx_response):
-    """Testa get_boss_wikitext() quando a página não existe."""
-    mock_data = {
-        "query": {
-            "pages": {
-                "999": {
-                    "pageid": 999,
-                    "title": "Non-existent Boss",
-                    "missing": True,
-                }
-            }
-        }
-    }
+@pytest.fixture(autouse=True)
+def no_sleep(monkeypatch):
+    """
+    Zera as esperas de backoff em todos os testes do módulo.
 
-    with patch.object(
-        tibiawiki_client, "_request_with_backoff", new_callable=AsyncMock
-    ) as mock_request:
-        mock_request.return_value = mock_httpx_response(json_data=mock_data)
+    O cliente chama asyncio.sleep pelo módulo asyncio; o mock é desfeito ao fim de cada teste.
+    """
+    mock_sleep = AsyncMock()
+    monkeypatch.setattr("app.services.tibiawiki_client.asyncio.sleep", mock_sleep)
+    return mock_sleep
 
-        wikitext = await tibiawiki_client.get_boss_wikitext(pageid=999)
 
-        assert wikitext is None
+@pytest.fixture
+def no_jitter(monkeypatch):
+    """Fixa o jitter em 1.0: a espera pedida é exatamente a do backoff."""
+    monkeypatch.setattr("app.services.tibiawiki_client.random.uniform", lambda a, b: 1.0)
 
 
-@pytest.mark.asyncio
-async def test_get_boss_wikitext_no_revisions(tibiawiki_client, mock_httpx_response):
-    """Testa get_boss_wikitext() quando não há revisões."""
-    mock_data = {
-        "query": {
-            "pages": {
-                "123": {
-                    "pageid": 123,
-                    "title": "Test Boss",
-                    "revisions": [],
-                }
-            }
-        }
-    }
+@pytest.fixture
+def wiki_api():
+    """
+    Estado da API simulada do TibiaWiki.
+
+    - responses: respostas devolvidas pelo transporte, uma por requisição, na ordem
+    - requests: requisições recebidas, na ordem
+    """
+    return {"responses": [], "requests": []}
+
 
-    with patch.object(
-        tibiawiki_client, "_request_with_backoff", new_callable=AsyncMock
-    ) as mock_request:
-        mock_request.return_value = mock_httpx_response(json_data=mock_data)
+@pytest.fixture(scope="module")
+def shared_tibiawiki_client():
+    """Instância única do TibiaWikiClient para o módulo (sem cache em disco)."""
+    with pytest.MonkeyPatch.context() as mp:
+        mp.delenv(TibiaWikiClient.CACHE_DIR_ENV, raising=False)
+        return TibiaWikiClient()
 
-        wikitext = await tibiawiki_client.get_boss_wikitext(pageid=123)
 
-        assert wikitext is None
+@pytest.fixture
+def tibiawiki_client(shared_tibiawiki_client):
+    """Fixture que entrega o cliente compartilhado com o estado de cada teste zerado."""
+    client = shared_tibiawiki_client
+    # Descarta o cliente HTTP (ou mock) e as páginas em cache deixados pelo teste anterior
+    client._client = None
+    client.limiter = None
+    client._wikitext_cache.clear()
+    return client
+
+
+@pytest_asyncio.fixture(loop_scope="session")
+async def wiki_transport(tibiawiki_client, wiki_api):
+    """
+    Liga o cliente a um httpx.AsyncClient real servido por MockTransport (sem rede).
+
+    A requisição passa por todo o pipeline do httpx (serialização de params, status, headers).
+    """
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        wiki_api["requests"].append(request)
+        return wiki_api["responses"].pop(0)
+
+    http_client = httpx.AsyncClient(
+        base_url=tibiawiki_client.base_url, transport=httpx.MockTransport(handler)
+    )
+    tibiawiki_client._client = http_client
+    yield wiki_api
+    await http_client.aclose()
+
+
+@pytest.mark.parametrize(
+    "pages",
+    [
+        pytest.param([_bosses(1, 2)], id="single-page"),
+        pytest.param([_bosses(1, 2), _bosses(3)], id="two-pages"),
+        pytest.param([_bosses(1), _bosses(2, 3), _bosses(4)], id="three-pages"),
+    ],
+)
+async def test_get_all_bosses_pagination(tibiawiki_client, mock_request, pages):
+    """Testa get_all_bosses() seguindo o cmcontinue até a última página."""
+    mock_request.side_effect = _paginated(pages)
+
+    bosses = await tibiawiki_client.get_all_bosses()
+
+    # Todos os bosses, na ordem das páginas
+    assert bosses == [boss for page in pages for boss in page]
+    # Uma requisição por página, cada uma com o token recebido na anterior
+    assert [call.kwargs["params"].get("cmcontinue") for call in mock_request.call_args_list] == [
+        None,
+        *(f"page-{n}" for n in range(2, len(pages) + 1)),
+    ]
+
+
+async def test_get_all_bosses_cancels_prefetch_on_error(
+    tibiawiki_client, mock_request, mock_httpx_response
+):
+    """Testa que um erro ao processar a página atual não deixa a próxima pendente."""
+    # "query" inválido (lista) falha depois de a próxima página já ter sido disparada
+    mock_request.side_effect = [
+        mock_httpx_response(json_data={"continue": {"cmcontinue": "page-2"}, "query": []}),
+        RuntimeError("próxima página"),
+    ]
+
+    with pytest.raises(AttributeError):
+        await tibiawiki_client.get_all_bosses()
+
+    pending = [
+        task
+        for task in asyncio.all_tasks()
+        if task is not asyncio.current_task() and "_fetch_bosses_page" in repr(task)
+    ]
+    assert pending == []
+
+
+@pytest.mark.parametrize(
+    "kwargs, payload, expected",
+    [
+        pytest.param(
+            {"pageid": 123},
+            _WIKITEXT_BY_ID_DATA,
+            "{{Infobox Boss|hp=50000|exp=10000}}",
+            id="by-pageid",
+        ),
+        pytest.param(
+            {"title": "Test Boss"},
+            _WIKITEXT_BY_TITLE_DATA,
+            "{{Infobox Boss|hp=30000}}",
+            id="by-title",
+        ),
+        # Página inexistente
+        pytest.param({"pageid": 999}, _MISSING_PAGE_DATA, None, id="missing-page"),
+        # Página sem revisões
+        pytest.param({"pageid": 123}, _NO_REVISIONS_DATA, None, id="no-revisions"),
+    ],
+)
+async def test_get_boss_wikitext(
+    tibiawiki_client, mock_request, mock_httpx_response, kwargs, payload, expected
+):
+    """Testa get_boss_wikitext() por pageid/title e para páginas sem conteúdo."""
+    mock_request.return_value = mock_httpx_response(json_data=payload)
+
+    wikitext = await tibiawiki_client.get_boss_wikitext(**kwargs)
+
+    assert wikitext == expected
+    mock_request.assert_called_once()
 
 
-@pytest.mark.asyncio
 async def test_get_boss_wikitext_raises_without_params(tibiawiki_client):
     """Testa que get_boss_wikitext() levanta ValueError sem pageid ou title."""
     with pytest.raises(ValueError, match="Deve fornecer pageid ou title"):
         await tibiawiki_client.get_boss_wikitext()
 
 
-@pytest.mark.asyncio
-async def test_exponential_backoff_on_429(tibiawiki_client, mock_httpx_response):
+async def test_exponential_backoff_on_429(tibiawiki_client, wiki_transport, no_sleep, no_jitter):
     """Testa exponential backoff para erros 429."""
-    from httpx import HTTPStatusError
-
     # Primeira tentativa: 429, Segunda tentativa: sucesso
-    error_response = MagicMock()
-    error_response.status_code = 429
-    error_response.raise_for_status = MagicMock(
-        side_effect=HTTPStatusError("Rate limited", request=MagicMock(), response=error_response)
-    )
+    wiki_transport["responses"] = [
+        httpx.Response(429),
+        httpx.Response(200, json={"query": {"categorymembers": _bosses(1)}}),
+    ]
 
-    success_response = mock_httpx_response(
-        json_data={"query": {"categorymembers": [{"pageid": 1, "title": "Boss 1"}]}}
-    )
+    bosses = await tibiawiki_client.get_all_bosses()
+
+    assert bosses == _bosses(1)
+    # Verifica que sleep foi chamado com o backoff inicial (sem jitter)
+    no_sleep.assert_awaited_once_with(TibiaWikiClient.INITIAL_BACKOFF)
+    # Verifica que houve 2 tentativas (1 erro + 1 sucesso)
+    assert len(wiki_transport["requests"]) == 2
+
+
+async def test_context_manager():
+    """Testa uso do cliente como context manager (abre e fecha o cliente HTTP)."""
+    # Substitui a classe do httpx: nenhum pool/SSL context real é criado
+    with patch("app.services.tibiawiki_client.httpx.AsyncClient") as mock_client_cls:
+        http_client = mock_client_cls.return_value
+        http_client.aclose = AsyncMock()
+
+        async with TibiaWikiClient() as client:
+            assert client._client is http_client
+
+        # Após sair do context, o cliente HTTP foi fechado e descartado
+        http_client.aclose.assert_awaited_once()
+        assert client._client is None
+
+
+@pytest.mark.parametrize(
+    "retry_after, min_wait, max_wait",
+    [
+        # Jitter só para cima: nunca antes do que o servidor pediu
+        pytest.param("10", 10, 10 * TibiaWikiClient.RETRY_AFTER_JITTER[1], id="jitter-above"),
+        # Retry-After acima do teto é limitado por MAX_BACKOFF
+        pytest.param("120", TibiaWikiClient.MAX_BACKOFF, TibiaWikiClient.MAX_BACKOFF, id="capped"),
+    ],
+)
+async def test_backoff_honors_retry_after(
+    tibiawiki_client, wiki_transport, no_sleep, retry_after, min_wait, max_wait
+):
+    """Testa que o header Retry-After define a espera (com jitter para cima e teto)."""
+    wiki_transport["responses"] = [
+        httpx.Response(429, headers={"Retry-After": retry_after}),
+        httpx.Response(200, json={"query": {"categorymembers": []}}),
+    ]
+
+    await tibiawiki_client.get_all_bosses()
+
+    ((wait_time,), _) = no_sleep.await_args
+    assert min_wait <= wait_time <= max_wait
+
+
+async def test_get_boss_wikitext_over_http(tibiawiki_client, wiki_transport):
+    """Testa get_boss_wikitext() de ponta a ponta pelo httpx (params serializados de verdade)."""
+    wiki_transport["responses"] = [httpx.Response(200, json=_WIKITEXT_BY_ID_DATA)]
+
+    wikitext = await tibiawiki_client.get_boss_wikitext(pageid=123)
+
+    assert wikitext == "{{Infobox Boss|hp=50000|exp=10000}}"
+    (request,) = wiki_transport["requests"]
+    assert request.method == "GET"
+    assert request.url.params["pageids"] == "123"
+    assert request.url.params["formatversion"] == "2"
+
+
+async def test_non_429_error_is_raised(tibiawiki_client, wiki_transport, no_sleep):
+    """Testa que erros HTTP diferentes de 429 sobem sem retry."""
+    wiki_transport["responses"] = [httpx.Response(500)]
+
+    with pytest.raises(httpx.HTTPStatusError):
+        await tibiawiki_client.get_all_bosses()
+
+    assert len(wiki_transport["requests"]) == 1
+    no_sleep.assert_not_awaited()
+
+
+async def test_get_boss_wikitext_uses_memory_cache(
+    tibiawiki_client, mock_request, mock_httpx_response
+):
+    """Testa que a mesma página não é buscada duas vezes pelo mesmo cliente."""
+    mock_request.return_value = mock_httpx_response(json_data=_WIKITEXT_PAGE)
 
-    # Mock do cliente HTTP interno
-    mock_client = AsyncMock()
-    mock_client.request = AsyncMock(side_effect=[error_response, success_response])
+    first = await tibiawiki_client.get_boss_wikitext(pageid=123)
+    second = await tibiawiki_client.get_boss_wikitext(pageid=123)
 
-    with patch("asyncio.sleep", new_callable=AsyncMock) as mock_sleep:
-        tibiawiki_client._client = mock_client
+    assert first == second == "{{Infobox Boss|hp=50000}}"
+    mock_request.assert_called_once()
 
-        bosses = await tibiawiki_client.get_all_bosses()
 
-        assert len(bosses) == 1
-        # Verifica que sleep foi chamado (backoff)
-        assert mock_sleep.called
-        # Verifica que houve 2 tentativas (1 erro + 1 sucesso)
-        assert mock_client.request.call_count == 2
+async def test_get_boss_wikitext_uses_disk_cache(
+    tibiawiki_client, mock_request, mock_httpx_response, tmp_path, monkeypatch
+):
+    """Testa que o cache em disco é reaproveitado por um novo cliente."""
+    writer = TibiaWikiClient(cache_dir=str(tmp_path))
+    writer._request_with_backoff = _async_stub(mock_httpx_response(json_data=_WIKITEXT_PAGE))
+    await writer.get_boss_wikitext(pageid=123)
 
+    assert (tmp_path / "pageid-123.txt").exists()
 
-@pytest.mark.asyncio
-async def test_context_manager(tibiawiki_client):
-    """Testa uso do cliente como context manager."""
-    async with TibiaWikiClient() as client:
-        assert client._client is not None
+    # O cliente compartilhado (cache em memória vazio) lê o mesmo diretório
+    monkeypatch.setattr(tibiawiki_client, "cache_dir", tmp_path)
+    wikitext = await tibiawiki_client.get_boss_wikitext(pageid=123)
 
-    # Após sair do context, cliente deve estar fechado
-    assert tibiawiki_client._client is None or tibiawiki_client._client.is_closed
+    assert wikitext == "{{Infobox Boss|hp=50000}}"
+    mock_request.assert_not_called()
@@ -1,268 +1,347 @@
 """Testes unitários para WikitextParser."""
 
+import textwrap
+
+import mwparserfromhell
 import pytest
 
 from app.models.boss import BossModel
 from app.services.wikitext_parser import ParserError, WikitextParser
 
 
-def test_parse_simple_boss():
-    """Testa parsing de um boss simples."""
-    wikitext = """
-    {{Infobox Boss
-    |name = Test Boss
-    |hp = 50000
-    |exp = 10000
-    |walks_through = Fire
-    |immunities = Energy
-    }}
-    """
-
-    boss = WikitextParser.parse(wikitext, "Test Boss")
-
-    assert isinstance(boss, BossModel)
-    assert boss.name == "Test Boss"
-    assert boss.hp == 50000
-    assert boss.exp == 10000
-    assert "Fire" in boss.walks_through
-    assert "Energy" in boss.immunities
-
-
-def test_parse_boss_with_complex_hp():
-    """Testa parsing de boss com HP complexo."""
-    wikitext = """
-    {{Infobox Boss
-    |name = Complex Boss
-    |hp = 50,000 (estimated)
-    |exp = 10,000
-    }}
-    """
-
-    boss = WikitextParser.parse(wikitext, "Complex Boss")
-
-    assert boss.hp == 50000
-    assert boss.exp == 10000
-
-
-def test_parse_boss_with_unknown_hp():
-    """Testa parsing de boss sem HP."""
-    wikitext = """
-    {{Infobox Boss
-    |name = Unknown HP Boss
-    |hp = ???
-    |exp = 10000
-    }}
-    """
-
-    boss = WikitextParser.parse(wikitext, "Unknown HP Boss")
-
-    assert boss.hp is None
-    assert boss.exp == 10000
-
-
-def test_parse_boss_with_variable_hp():
-    """Testa parsing de boss com HP variável."""
-    wikitext = """
-    {{Infobox Boss
-    |name = Variable Boss
-    |hp = Variable
-    }}
-    """
-
-    boss = WikitextParser.parse(wikitext, "Variable Boss")
-
-    assert boss.hp is None
-
-
-def test_parse_boss_with_immunities_list():
-    """Testa parsing de boss com múltiplas immunities."""
-    wikitext = """
-    {{Infobox Boss
-    |name = Immune Boss
-    |immunities = Fire, Energy (partial)
-    }}
-    """
-
-    boss = WikitextParser.parse(wikitext, "Immune Boss")
-
-    assert "Fire" in boss.immunities
-    assert "Energy" in boss.immunities
-    assert len(boss.immunities) == 2
-
-
-def test_parse_boss_without_infobox():
-    """Testa parsing de wikitext sem Infobox Boss."""
-    wikitext = """
-    Este é um texto qualquer sem template.
-    """
-
-    with pytest.raises(
-        ParserError, match="Template 'Infobox Boss' ou 'Infobox Creature' não encontrado"
-    ):
-        WikitextParser.parse(wikitext, "Test Boss")
-
-
-def test_parse_empty_wikitext():
-    """Testa parsing de wikitext vazio."""
-    with pytest.raises(ParserError, match="Wikitext vazio"):
-        WikitextParser.parse("", "Test Boss")
-
-
-def test_parse_boss_old_format():
-    """Testa parsing de boss com formato antigo."""
-    wikitext = """
-    {{Infobox Boss
-    |hitpoints = 50000
-    |experience = 10000
-    }}
-    """
-
-    boss = WikitextParser.parse(wikitext, "Old Format Boss")
-
-    assert boss.hp == 50000
-    assert boss.exp == 10000
-
-
-def test_parse_boss_new_format():
-    """Testa parsing de boss com formato novo."""
-    wikitext = """
-    {{Infobox Boss
-    |hp = 50000
-    |exp = 10000
-    }}
-    """
-
-    boss = WikitextParser.parse(wikitext, "New Format Boss")
-
-    assert boss.hp == 50000
-    assert boss.exp == 10000
-
-
-def test_parse_boss_with_broken_formatting():
-    """Testa parsing de boss com formatação quebrada."""
-    wikitext = """
-    {{Infobox Boss
-    |hp = 50,000 (estimated) (maybe)
-    |exp = ???
-    |walks_through = Fire, Energy, Ice (all partial)
-    }}
-    """
-
-    boss = WikitextParser.parse(wikitext, "Broken Format Boss")
-
+def _wikitext(text):
+    """Normaliza um literal de teste (dedent + strip), uma única vez na importação."""
+    return textwrap.dedent(text).strip()
+
+
+# (wikitext, boss_name passado ao parser, campos esperados no BossModel)
+PARSE_CASES = [
+    pytest.param(
+        _wikitext(
+            """
+            {{Infobox Boss
+            |name = Test Boss
+            |hp = 50000
+            |exp = 10000
+            |walks_through = Fire
+            |immunities = Energy
+            }}
+            """
+        ),
+        "Test Boss",
+        {
+            "name": "Test Boss",
+            "hp": 50000,
+            "exp": 10000,
+            "walks_through": ["Fire"],
+            "immunities": ["Energy"],
+        },
+        id="simple-boss",
+    ),
+    pytest.param(
+        _wikitext(
+            """
+            {{Infobox Boss
+            |name = Complex Boss
+            |hp = 50,000 (estimated)
+            |exp = 10,000
+            }}
+            """
+        ),
+        "Complex Boss",
+        {"hp": 50000, "exp": 10000},
+        id="complex-hp",
+    ),
+    pytest.param(
+        _wikitext(
+            """
+            {{Infobox Boss
+            |name = Unknown HP Boss
+            |hp = ???
+            |exp = 10000
+            }}
+            """
+        ),
+        "Unknown HP Boss",
+        {"hp": None, "exp": 10000},
+        id="unknown-hp",
+    ),
+    pytest.param(
+        _wikitext(
+            """
+            {{Infobox Boss
+            |name = Variable Boss
+            |hp = Variable
+            }}
+            """
+        ),
+        "Variable Boss",
+        {"hp": None},
+        id="variable-hp",
+    ),
+    pytest.param(
+        _wikitext(
+            """
+            {{Infobox Boss
+            |name = Immune Boss
+            |immunities = Fire, Energy (partial)
+            }}
+            """
+        ),
+        "Immune Boss",
+        {"immunities": ["Fire", "Energy"]},
+        id="immunities-list",
+    ),
+    pytest.param(
+        _wikitext(
+            """
+            {{Infobox Boss
+            |hitpoints = 50000
+            |experience = 10000
+            }}
+            """
+        ),
+        "Old Format Boss",
+        {"hp": 50000, "exp": 10000},
+        id="old-format",
+    ),
+    pytest.param(
+        _wikitext(
+            """
+            {{Infobox Boss
+            |hp = 50000
+            |exp = 10000
+            }}
+            """
+        ),
+        "New Format Boss",
+        {"hp": 50000, "exp": 10000},
+        id="new-format",
+    ),
     # Deve conseguir extrair o HP mesmo com formatação quebrada
-    assert boss.hp == 50000
-    assert boss.exp is None
-    assert len(boss.walks_through) >= 2
-
-
-def test_parse_boss_name_from_template():
-    """Testa que o nome pode ser extraído do template."""
-    wikitext = """
-    {{Infobox Boss
-    |Test Boss Name
-    |hp = 50000
-    }}
-    """
-
-    boss = WikitextParser.parse(wikitext)
-
+    pytest.param(
+        _wikitext(
+            """
+            {{Infobox Boss
+            |hp = 50,000 (estimated) (maybe)
+            |exp = ???
+            |walks_through = Fire, Energy, Ice (all partial)
+            }}
+            """
+        ),
+        "Broken Format Boss",
+        {"hp": 50000, "exp": None, "walks_through": ["Fire", "Energy", "Ice"]},
+        id="broken-formatting",
+    ),
     # O nome deve ser extraído do primeiro parâmetro sem nome
-    assert boss.name == "Test Boss Name"
-
-
-def test_parse_boss_name_fallback():
-    """Testa que o nome usa fallback quando não encontrado."""
-    wikitext = """
-    {{Infobox Boss
-    |hp = 50000
-    }}
-    """
-
-    boss = WikitextParser.parse(wikitext, "Fallback Name")
-
-    assert boss.name == "Fallback Name"
-
-
-def test_parse_boss_case_insensitive_template():
-    """Testa que o template é encontrado case-insensitive."""
-    wikitext = """
-    {{infobox boss
-    |hp = 50000
-    }}
-    """
-
-    boss = WikitextParser.parse(wikitext, "Case Insensitive Boss")
+    pytest.param(
+        _wikitext(
+            """
+            {{Infobox Boss
+            |Test Boss Name
+            |hp = 50000
+            }}
+            """
+        ),
+        None,
+        {"name": "Test Boss Name"},
+        id="name-from-template",
+    ),
+    pytest.param(
+        _wikitext(
+            """
+            {{Infobox Boss
+            |hp = 50000
+            }}
+            """
+        ),
+        "Fallback Name",
+        {"name": "Fallback Name"},
+        id="name-fallback",
+    ),
+    pytest.param(
+        _wikitext(
+            """
+            {{infobox boss
+            |hp = 50000
+            }}
+            """
+        ),
+        "Case Insensitive Boss",
+        {"hp": 50000},
+        id="case-insensitive-template",
+    ),
+    pytest.param(
+        _wikitext(
+            """
+            {{Infobox Boss
+            |health = 50000
+            |xp = 10000
+            |walksthrough = Fire
+            |immune = Energy
+            }}
+            """
+        ),
+        "Alternative Fields Boss",
+        {"hp": 50000, "exp": 10000, "walks_through": ["Fire"], "immunities": ["Energy"]},
+        id="alternative-field-names",
+    ),
+    pytest.param(
+        _wikitext(
+            """
+            {{Infobox Boss
+            |name = Minimal Boss
+            }}
+            """
+        ),
+        None,
+        {"name": "Minimal Boss", "hp": None, "exp": None, "walks_through": [], "immunities": []},
+        id="minimal",
+    ),
+    pytest.param(
+        _wikitext(
+            """
+            {{Infobox Creature
+            |name = Creature Boss
+            |hp = 50000
+            |exp = 10000
+            |isboss = yes
+            }}
+            """
+        ),
+        "Creature Boss",
+        {"name": "Creature Boss", "hp": 50000, "exp": 10000},
+        id="infobox-creature",
+    ),
+    # Infobox Creature sem campo isboss, mas com hp/exp
+    pytest.param(
+        _wikitext(
+            """
+            {{Infobox Creature
+            |name = Creature Boss 2
+            |hp = 30000
+            |exp = 5000
+            }}
+            """
+        ),
+        "Creature Boss 2",
+        {"name": "Creature Boss 2", "hp": 30000, "exp": 5000},
+        id="infobox-creature-no-isboss",
+    ),
+    # Parâmetros repetidos: listas são concatenadas, valores vazios não sobrescrevem
+    pytest.param(
+        _wikitext(
+            """
+            {{Infobox Boss
+            |name = Duplicate Boss
+            |hp = 1000
+            |hp =
+            |immunities = Fire
+            |immunities = [[Energy]]
+            }}
+            """
+        ),
+        "Duplicate Boss",
+        {"name": "Duplicate Boss", "hp": 1000, "immunities": ["Fire", "Energy"]},
+        id="duplicate-params",
+    ),
+]
+
+
+@pytest.mark.parametrize("wikitext, boss_name, expected", PARSE_CASES)
+def test_parse(wikitext, boss_name, expected):
+    """Testa a extração dos campos do infobox para cada variação de wikitext."""
+    boss = WikitextParser.parse(wikitext, boss_name)
 
-    assert boss.hp == 50000
-
-
-def test_parse_boss_with_alternative_field_names():
-    """Testa parsing com nomes alternativos de campos."""
-    wikitext = """
-    {{Infobox Boss
-    |health = 50000
-    |xp = 10000
-    |walksthrough = Fire
-    |immune = Energy
-    }}
-    """
-
-    boss = WikitextParser.parse(wikitext, "Alternative Fields Boss")
-
-    assert boss.hp == 50000
-    assert boss.exp == 10000
-    assert "Fire" in boss.walks_through
-    assert "Energy" in boss.immunities
-
-
-def test_parse_boss_minimal():
-    """Testa parsing de boss com apenas nome."""
-    wikitext = """
-    {{Infobox Boss
-    |name = Minimal Boss
-    }}
-    """
-
-    boss = WikitextParser.parse(wikitext)
-
-    assert boss.name == "Minimal Boss"
-    assert boss.hp is None
-    assert boss.exp is None
-    assert boss.walks_through == []
-    assert boss.immunities == []
-
-
-def test_parse_boss_with_infobox_creature():
-    """Testa parsing de boss com template Infobox Creature."""
-    wikitext = """
-    {{Infobox Creature
-    |name = Creature Boss
-    |hp = 50000
-    |exp = 10000
-    |isboss = yes
-    }}
-    """
-
-    boss = WikitextParser.parse(wikitext, "Creature Boss")
-
-    assert boss.name == "Creature Boss"
-    assert boss.hp == 50000
-    assert boss.exp == 10000
-
-
-def test_parse_boss_with_infobox_creature_no_isboss():
-    """Testa parsing de boss com Infobox Creature sem campo isboss mas com hp/exp."""
-    wikitext = """
-    {{Infobox Creature
-    |name = Creature Boss 2
-    |hp = 30000
-    |exp = 5000
-    }}
-    """
+    assert isinstance(boss, BossModel)
+    # Uma única comparação de dicts: o diff da falha mostra todos os campos divergentes
+    assert {field: getattr(boss, field) for field in expected} == expected
+
+
+@pytest.mark.parametrize(
+    "wikitext, message",
+    [
+        pytest.param(
+            _wikitext(
+                """
+                Este é um texto qualquer sem template.
+                """
+            ),
+            "Template 'Infobox Boss' ou 'Infobox Creature' não encontrado",
+            id="without-infobox",
+        ),
+        pytest.param("", "Wikitext vazio", id="empty-wikitext"),
+    ],
+)
+def test_parse_raises(wikitext, message):
+    """Testa que wikitext vazio ou sem infobox levanta ParserError."""
+    with pytest.raises(ParserError, match=message):
+        WikitextParser.parse(wikitext, "Test Boss")
 
-    boss = WikitextParser.parse(wikitext, "Creature Boss 2")
 
-    assert boss.name == "Creature Boss 2"
-    assert boss.hp == 30000
-    assert boss.exp == 5000
+# (wikitext, o scanner resolve sem o parse completo)
+SCANNER_AGREEMENT_CASES = [
+    pytest.param(
+        "<!-- {{Infobox Boss|name=Old|hp=1}} -->\n{{Infobox Boss|name=New|hp=2}}",
+        True,
+        id="commented-out-infobox",
+    ),
+    pytest.param("{{Infobox Boss|name=X|hp=5<ref>a|b=c</ref>}}", False, id="ref-with-pipe"),
+    pytest.param("{{Infobox Boss|name=X|hp=<nowiki>1|2</nowiki>}}", False, id="nowiki"),
+    pytest.param(
+        "<nowiki>{{Infobox Boss|name=Old|hp=1}}</nowiki>{{Infobox Boss|name=New|hp=2}}",
+        False,
+        id="nowiki-outside-template",
+    ),
+    pytest.param("{{Infobox Boss|name=X|hp={{{hp|5}}}}}", False, id="triple-brace"),
+    pytest.param("{{Infobox Boss|name=X|hp=1<!-- a|b=c -->}}", False, id="comment-in-template"),
+    pytest.param(
+        "{{Infobox Boss|name=X|loot={{Loot Item|Gold Coin|100}}|hp=1}}",
+        True,
+        id="nested-template",
+    ),
+    pytest.param(
+        "{{Infobox Boss|name=X|location=[[Venore|the city]]|hp=1}}", True, id="piped-link"
+    ),
+    pytest.param("{{Infobox Creature|Positional|hp=10}}", True, id="positional-param"),
+    pytest.param("{{Other|{{Infobox Boss|name=Inner|hp=3}}}}", True, id="infobox-inside-template"),
+    pytest.param(
+        "{{Infobox Boss|name=X|loot=Gold|loot=Platinum|hp=1|hp=}}", True, id="duplicate-params"
+    ),
+]
+
+
+@pytest.mark.parametrize("wikitext, scanned", SCANNER_AGREEMENT_CASES)
+def test_scanner_agrees_with_mwparserfromhell(wikitext, scanned):
+    """Testa que o scanner encontra os mesmos parâmetros do mwparserfromhell (ou cede a ele)."""
+    expected = WikitextParser._find_infobox_boss(mwparserfromhell.parse(wikitext))
+    params = WikitextParser._scan_infobox(wikitext)
+
+    assert (params is not None) is scanned
+    assert (params if scanned else expected) == expected
+
+
+def test_prefilter_error_matches_full_parse_error():
+    """Testa que o pré-filtro e o parse completo geram o mesmo erro para wikitext sem infobox."""
+    with pytest.raises(ParserError) as prefiltered:
+        WikitextParser.parse("Texto sem template.", "Test Boss")
+    # Passa pelo pré-filtro ("{{" e "infobox" presentes), mas não tem infobox de boss
+    with pytest.raises(ParserError) as parsed:
+        WikitextParser.parse("{{Navbox}} infobox", "Test Boss")
+
+    assert str(prefiltered.value) == str(parsed.value)
+    assert str(parsed.value).startswith("Erro inesperado ao processar wikitext: Template")
+
+
+@pytest.mark.parametrize(
+    "raw, expected",
+    [
+        ("Morgaroth.gif", "Morgaroth.gif"),
+        ("[[File:Morgaroth.gif]]", "Morgaroth.gif"),
+        ("[[:File:The Abyssador.gif|200px]]", "The Abyssador.gif"),
+        ("Image:Ferumbras.gif", "Ferumbras.gif"),
+    ],
+)
+def test_normalize_image_filename(raw, expected):
+    """Testa normalização do nome do arquivo de imagem."""
+    assert WikitextParser._normalize_image_filename(raw) == expected